@@ -2,13 +2,39 @@
 Redis客户端配置和连接管理
 """
 
+import redis as redis_pkg
 import redis.asyncio as redis
+from redis.utils import HIREDIS_AVAILABLE
 import logging
 from typing import Optional
 from .config import settings
+from tradingagents.utils import fast_json
 
 logger = logging.getLogger(__name__)
 
+class _ConnectOutsideLockPool(redis.ConnectionPool):
+    """
+    在锁外建立连接的连接池
+
+    redis-py 5.3 ~ 7.x 的 ConnectionPool.get_connection 在持有 asyncio.Lock 期间
+    await ensure_connection（建连/健康检查 PING），高并发时所有协程都串行排队等待这次网络往返。
+    取连接本身是不含 await 的纯内存操作，在单线程事件循环中天然原子，因此无需加锁；
+    ensure_connection 放到锁外并发执行。redis-py 8.x 已采用同样的做法，直接使用原生连接池。
+    """
+
+    async def get_connection(self, command_name=None, *keys, **options):
+        connection = self.get_available_connection()
+        try:
+            await self.ensure_connection(connection)
+        except BaseException:
+            await self.release(connection)
+            raise
+        return connection
+
+
+_REDIS_MAJOR_VERSION = int(redis_pkg.__version__.split(".")[0])
+_POOL_CLASS = _ConnectOutsideLockPool if _REDIS_MAJOR_VERSION < 8 else redis.ConnectionPool
+
 # 全局Redis连接池
 redis_pool: Optional[redis.ConnectionPool] = None
 redis_client: Optional[redis.Redis] = None
@@ -20,7 +46,7 @@ async def init_redis():
 
     try:
         # 创建连接池
-        redis_pool = redis.ConnectionPool.from_url(
+        redis_pool = _POOL_CLASS.from_url(
             settings.REDIS_URL,
             max_connections=settings.REDIS_MAX_CONNECTIONS,  # 使用配置文件中的值
             retry_on_timeout=settings.REDIS_RETRY_ON_TIMEOUT,
@@ -39,7 +65,12 @@ async def init_redis():
 
         # 测试连接
         await redis_client.ping()
-        logger.info(f"✅ Redis连接成功建立 (max_connections={settings.REDIS_MAX_CONNECTIONS})")
+        logger.info(
+            f"✅ Redis连接成功建立 (max_connections={settings.REDIS_MAX_CONNECTIONS}, "
+            f"parser={'hiredis' if HIREDIS_AVAILABLE else 'python'})"
+        )
+        if not HIREDIS_AVAILABLE:
+            logger.info("💡 未安装 hiredis，使用纯 Python 协议解析器；pip install hiredis 可提升大值读取性能")
 
     except Exception as e:
         logger.error(f"❌ Redis连接失败: {e}")
@@ -113,16 +144,14 @@ class RedisService:
     
     async def get_json(self, key: str):
         """获取JSON格式的值"""
-        import json
         value = await self.redis.get(key)
         if value:
-            return json.loads(value)
+            return fast_json.loads(value)
         return None
     
     async def set_json(self, key: str, value: dict, ttl: int = None):
         """设置JSON格式的值"""
-        import json
-        json_str = json.dumps(value, ensure_ascii=False)
+        json_str = fast_json.dumps(value)
         if ttl:
             await self.redis.setex(key, ttl, json_str)
         else:
@@ -138,15 +167,13 @@ class RedisService:
     
     async def add_to_queue(self, queue_key: str, item: dict):
         """添加项目到队列"""
-        import json
-        await self.redis.lpush(queue_key, json.dumps(item, ensure_ascii=False))
+        await self.redis.lpush(queue_key, fast_json.dumps(item))
     
     async def pop_from_queue(self, queue_key: str, timeout: int = 1):
         """从队列弹出项目"""
-        import json
         result = await self.redis.brpop(queue_key, timeout=timeout)
         if result:
-            return json.loads(result[1])
+            return fast_json.loads(result[1])
         return None
     
     async def get_queue_length(self, queue_key: str):
@@ -1,10 +1,22 @@
 """
 统一API响应格式工具
 """
+import json
 from datetime import datetime
-from typing import Any, Optional, Dict
+from typing import Any, Optional, Dict, Union
+
+from fastapi import Response
+from fastapi.responses import JSONResponse
+
 from app.utils.timezone import now_tz
 
+try:
+    import orjson  # noqa: F401
+    from fastapi.responses import ORJSONResponse as DefaultJSONResponse
+except ImportError:  # pragma: no cover - orjson 为可选依赖（perf extra）
+    # 未安装 orjson 时退回标准库 json 编码
+    DefaultJSONResponse = JSONResponse
+
 
 def ok(data: Any = None, message: str = "ok") -> Dict[str, Any]:
     """标准成功响应
@@ -28,3 +40,18 @@ def fail(message: str = "error", code: int = 500, data: Any = None) -> Dict[str,
         "timestamp": now_tz().isoformat()
     }
 
+
+def ok_preserialized(data_json: Union[bytes, str], message: str = "ok") -> Response:
+    """标准成功响应，data 为预先序列化好的 JSON
+
+    用于返回内容在进程内固定的接口：data 只在启动时序列化一次，每次请求只拼接 timestamp，
+    结构与 ok() 完全一致
+    """
+    if isinstance(data_json, str):
+        data_json = data_json.encode("utf-8")
+    body = b"".join((
+        b'{"success":true,"data":', data_json,
+        b',"message":', json.dumps(message, ensure_ascii=False).encode("utf-8"),
+        b',"timestamp":"', now_tz().isoformat().encode("ascii"), b'"}',
+    ))
+    return Response(content=body, media_type="application/json")
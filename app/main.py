@@ -16,16 +16,17 @@ For commercial licensing, please contact: hsliup@163.com
 from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.middleware.trustedhost import TrustedHostMiddleware
-from fastapi.responses import JSONResponse
 import uvicorn
 import logging
 import time
 from datetime import datetime
 from contextlib import asynccontextmanager
+from functools import lru_cache
 import asyncio
 from pathlib import Path
 
 from app.core.config import settings
+from app.core.response import DefaultJSONResponse
 from app.core.database import init_db, close_db
 from app.core.logging_config import setup_logging
 from app.routers import auth_db as auth, analysis, screening, queue, sse, health, favorites, config, reports, database, operation_logs, tags, tushare_init, akshare_init, baostock_init, historical_data, multi_period_sync, financial_data, news_data, social_media, internal_messages, usage_statistics, model_capabilities, cache, logs
@@ -37,42 +38,17 @@ from app.routers import multi_market_stocks as multi_market_stocks_router
 from app.routers import notifications as notifications_router
 from app.routers import websocket_notifications as websocket_notifications_router
 from app.routers import scheduler as scheduler_router
-from app.services.basics_sync_service import get_basics_sync_service
-from app.services.multi_source_basics_sync_service import MultiSourceBasicsSyncService
 from app.services.scheduler_service import set_scheduler_instance
-from app.worker.tushare_sync_service import (
-    run_tushare_basic_info_sync,
-    run_tushare_quotes_sync,
-    run_tushare_historical_sync,
-    run_tushare_financial_sync,
-    run_tushare_status_check
-)
-from app.worker.akshare_sync_service import (
-    run_akshare_basic_info_sync,
-    run_akshare_quotes_sync,
-    run_akshare_historical_sync,
-    run_akshare_financial_sync,
-    run_akshare_status_check
-)
-from app.worker.baostock_sync_service import (
-    run_baostock_basic_info_sync,
-    run_baostock_daily_quotes_sync,
-    run_baostock_historical_sync,
-    run_baostock_status_check
-)
 # 港股和美股改为按需获取+缓存模式，不再需要定时同步任务
 # from app.worker.hk_sync_service import ...
 # from app.worker.us_sync_service import ...
 from app.middleware.operation_log_middleware import OperationLogMiddleware
-from apscheduler.schedulers.asyncio import AsyncIOScheduler
-from apscheduler.triggers.cron import CronTrigger
-from apscheduler.triggers.interval import IntervalTrigger
-from app.services.quotes_ingestion_service import QuotesIngestionService
 from app.routers import paper as paper_router
 
 
+@lru_cache(maxsize=1)
 def get_version() -> str:
-    """从 VERSION 文件读取版本号"""
+    """从 VERSION 文件读取版本号（进程内只读一次，运行期间版本不会变化）"""
     try:
         version_file = Path(__file__).parent.parent / "VERSION"
         if version_file.exists():
@@ -259,6 +235,9 @@ async def lifespan(app: FastAPI):
     logger.info("TradingAgents FastAPI backend started")
 
     # 启动期：若需要在休市时补充上一交易日收盘快照
+    # 调度器与各数据源同步任务只在启动时用到，在此按需导入，避免 import app.main 时加载整套同步模块
+    from app.services.quotes_ingestion_service import QuotesIngestionService
+
     if settings.QUOTES_BACKFILL_ON_STARTUP:
         try:
             qi = QuotesIngestionService()
@@ -268,6 +247,31 @@ async def lifespan(app: FastAPI):
             logger.warning(f"Startup backfill failed (ignored): {e}")
 
     # 启动每日定时任务：可配置
+    from apscheduler.schedulers.asyncio import AsyncIOScheduler
+    from apscheduler.triggers.cron import CronTrigger
+    from apscheduler.triggers.interval import IntervalTrigger
+    from app.services.multi_source_basics_sync_service import MultiSourceBasicsSyncService
+    from app.worker.tushare_sync_service import (
+        run_tushare_basic_info_sync,
+        run_tushare_quotes_sync,
+        run_tushare_historical_sync,
+        run_tushare_financial_sync,
+        run_tushare_status_check
+    )
+    from app.worker.akshare_sync_service import (
+        run_akshare_basic_info_sync,
+        run_akshare_quotes_sync,
+        run_akshare_historical_sync,
+        run_akshare_financial_sync,
+        run_akshare_status_check
+    )
+    from app.worker.baostock_sync_service import (
+        run_baostock_basic_info_sync,
+        run_baostock_daily_quotes_sync,
+        run_baostock_historical_sync,
+        run_baostock_status_check
+    )
+
     scheduler: AsyncIOScheduler | None = None
     try:
         from croniter import croniter
@@ -607,6 +611,8 @@ app = FastAPI(
     version=get_version(),
     docs_url="/docs" if settings.DEBUG else None,
     redoc_url="/redoc" if settings.DEBUG else None,
+    # 默认使用 orjson 编码响应（C 实现，原生支持 numpy 数值），未安装时退回 JSONResponse
+    default_response_class=DefaultJSONResponse,
     lifespan=lifespan
 )
 
@@ -632,25 +638,30 @@ app.add_middleware(OperationLogMiddleware)
 
 
 # 请求日志中间件
+_REQUEST_LOG_SKIP_PATHS = frozenset(("/health", "/favicon.ico"))
+_request_logger = logging.getLogger("webapi")
+
+
 @app.middleware("http")
 async def log_requests(request: Request, call_next):
-    start_time = time.time()
+    start_ns = time.perf_counter_ns()
 
     # 跳过健康检查和静态文件请求的日志
-    if request.url.path in ["/health", "/favicon.ico"] or request.url.path.startswith("/static"):
+    path = request.url.path
+    if path in _REQUEST_LOG_SKIP_PATHS or path.startswith("/static"):
         response = await call_next(request)
         return response
 
     # 使用webapi logger记录请求
-    logger = logging.getLogger("webapi")
-    logger.info(f"🔄 {request.method} {request.url.path} - 开始处理")
+    logger = _request_logger
+    logger.info(f"🔄 {request.method} {path} - 开始处理")
 
     response = await call_next(request)
-    process_time = time.time() - start_time
+    process_time = (time.perf_counter_ns() - start_ns) / 1e9
 
     # 记录请求完成
     status_emoji = "✅" if response.status_code < 400 else "❌"
-    logger.info(f"{status_emoji} {request.method} {request.url.path} - 状态: {response.status_code} - 耗时: {process_time:.3f}s")
+    logger.info(f"{status_emoji} {request.method} {path} - 状态: {response.status_code} - 耗时: {process_time:.3f}s")
 
     return response
 
@@ -663,7 +674,7 @@ app.add_middleware(RequestIDMiddleware)
 @app.exception_handler(Exception)
 async def global_exception_handler(request: Request, exc: Exception):
     logging.error(f"Unhandled exception: {exc}", exc_info=True)
-    return JSONResponse(
+    return DefaultJSONResponse(
         status_code=500,
         content={
             "error": {
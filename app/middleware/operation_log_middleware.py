@@ -59,8 +59,8 @@ class OperationLogMiddleware(BaseHTTPMiddleware):
         if self._should_skip_logging(request):
             return await call_next(request)
 
-        # 记录开始时间
-        start_time = time.time()
+        # 记录开始时间（单调时钟，整数纳秒）
+        start_ns = time.perf_counter_ns()
 
         # 获取请求信息
         method = request.method
@@ -75,7 +75,7 @@ class OperationLogMiddleware(BaseHTTPMiddleware):
         response = await call_next(request)
 
         # 计算耗时
-        duration_ms = int((time.time() - start_time) * 1000)
+        duration_ms = (time.perf_counter_ns() - start_ns) // 1_000_000
 
         # 异步记录操作日志
         if user_info:
@@ -28,8 +28,8 @@ class RequestIDMiddleware(BaseHTTPMiddleware):
         # 将 trace_id 写入 contextvars
         token = trace_id_var.set(trace_id)
 
-        # 记录请求开始时间
-        start_time = time.time()
+        # 记录请求开始时间（单调时钟，不受系统时间调整影响）
+        start_ns = time.perf_counter_ns()
 
         # 记录请求信息
         logger.info(
@@ -43,7 +43,7 @@ class RequestIDMiddleware(BaseHTTPMiddleware):
             response = await call_next(request)
 
             # 计算处理时间
-            process_time = time.time() - start_time
+            process_time = (time.perf_counter_ns() - start_ns) / 1e9
 
             # 添加响应头
             response.headers["X-Trace-ID"] = trace_id
@@ -59,7 +59,7 @@ class RequestIDMiddleware(BaseHTTPMiddleware):
 
         except Exception as exc:
             # 计算处理时间
-            process_time = time.time() - start_time
+            process_time = (time.perf_counter_ns() - start_ns) / 1e9
 
             # 记录请求异常信息
             logger.error(
@@ -1,12 +1,14 @@
 from fastapi import APIRouter
 import time
+from functools import lru_cache
 from pathlib import Path
 
 router = APIRouter()
 
 
+@lru_cache(maxsize=1)
 def get_version() -> str:
-    """从 VERSION 文件读取版本号"""
+    """从 VERSION 文件读取版本号（进程内只读一次，运行期间版本不会变化）"""
     try:
         version_file = Path(__file__).parent.parent.parent / "VERSION"
         if version_file.exists():
@@ -15,13 +15,43 @@ import logging
 
 from app.routers.auth_db import get_current_user
 from app.core.database import get_mongo_db
-from app.core.response import ok
+from app.core.response import ok, ok_preserialized
 from app.services.unified_stock_service import UnifiedStockService
+from tradingagents.utils.fast_json import dumps as fast_json_dumps
 
 logger = logging.getLogger("webapi")
 
 router = APIRouter(prefix="/markets", tags=["multi-market"])
 
+# 支持的市场列表在进程内固定，启动时序列化一次
+_SUPPORTED_MARKETS = [
+    {
+        "code": "CN",
+        "name": "A股",
+        "name_en": "China A-Shares",
+        "currency": "CNY",
+        "timezone": "Asia/Shanghai",
+        "trading_hours": "09:30-15:00"
+    },
+    {
+        "code": "HK",
+        "name": "港股",
+        "name_en": "Hong Kong Stocks",
+        "currency": "HKD",
+        "timezone": "Asia/Hong_Kong",
+        "trading_hours": "09:30-16:00"
+    },
+    {
+        "code": "US",
+        "name": "美股",
+        "name_en": "US Stocks",
+        "currency": "USD",
+        "timezone": "America/New_York",
+        "trading_hours": "09:30-16:00 EST"
+    }
+]
+_MARKETS_DATA_JSON = fast_json_dumps({"markets": _SUPPORTED_MARKETS})
+
 
 @router.get("", response_model=dict)
 async def get_supported_markets(current_user: dict = Depends(get_current_user)):
@@ -45,34 +75,7 @@ async def get_supported_markets(current_user: dict = Depends(get_current_user)):
             }
         }
     """
-    markets = [
-        {
-            "code": "CN",
-            "name": "A股",
-            "name_en": "China A-Shares",
-            "currency": "CNY",
-            "timezone": "Asia/Shanghai",
-            "trading_hours": "09:30-15:00"
-        },
-        {
-            "code": "HK",
-            "name": "港股",
-            "name_en": "Hong Kong Stocks",
-            "currency": "HKD",
-            "timezone": "Asia/Hong_Kong",
-            "trading_hours": "09:30-16:00"
-        },
-        {
-            "code": "US",
-            "name": "美股",
-            "name_en": "US Stocks",
-            "currency": "USD",
-            "timezone": "America/New_York",
-            "trading_hours": "09:30-16:00 EST"
-        }
-    ]
-    
-    return ok(data={"markets": markets})
+    return ok_preserialized(_MARKETS_DATA_JSON)
 
 
 @router.get("/{market}/stocks/search", response_model=dict)
@@ -2,6 +2,7 @@
 股票数据API路由 - 基于扩展数据模型
 提供标准化的股票数据访问接口
 """
+import re
 from typing import Optional, List
 from fastapi import APIRouter, Depends, HTTPException, Query
 from fastapi import status
@@ -246,10 +247,12 @@ async def search_stocks(
             search_conditions.append({"symbol": keyword})
         else:
             # 按名称模糊匹配
-            search_conditions.append({"name": {"$regex": keyword, "$options": "i"}})
+            # 关键词按字面量匹配（转义正则元字符，"*ST" 等名称不会被当作正则）
+            pattern = re.escape(keyword)
+            search_conditions.append({"name": {"$regex": pattern, "$options": "i"}})
             # 如果包含数字，也尝试代码匹配
             if any(c.isdigit() for c in keyword):
-                search_conditions.append({"symbol": {"$regex": keyword}})
+                search_conditions.append({"symbol": {"$regex": pattern}})
 
         # 🔥 添加数据源筛选：只查询优先级最高的数据源
         query = {
@@ -28,6 +28,45 @@ def _zfill_code(code: str) -> str:
         return str(code)
 
 
+def _kline_items_from_frame(df) -> List[Dict[str, Any]]:
+    """
+    按列把 MongoDB K线 DataFrame 转为前端需要的记录列表
+
+    每列只做一次 float 转换，最后一次性组装成 dict，替代逐行 iterrows
+    """
+    n = len(df)
+
+    def column(*names, default=0.0):
+        for name in names:
+            if name in df.columns:
+                return df[name].astype("float64").tolist()
+        return [default] * n
+
+    if "trade_date" in df.columns:
+        times = df["trade_date"].tolist()
+    elif "date" in df.columns:
+        times = df["date"].tolist()
+    else:
+        times = [""] * n
+    amounts = column("amount", default=None)
+
+    return [
+        {
+            "time": t,  # 前端期望 time 字段
+            "open": o,
+            "high": h,
+            "low": lo,
+            "close": c,
+            "volume": v,
+            "amount": a,
+        }
+        for t, o, h, lo, c, v, a in zip(
+            times, column("open"), column("high"), column("low"), column("close"),
+            column("volume", "vol"), amounts,
+        )
+    ]
+
+
 def _detect_market_and_code(code: str) -> Tuple[str, str]:
     """
     检测股票代码的市场类型并标准化代码
@@ -418,6 +457,30 @@ async def get_fundamentals(
     return ok(data)
 
 
+def _kline_columnar(items: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    把K线记录列表转为列式结构：{"columns": [...], "data": {列名: [值, ...]}}
+
+    大区间请求时每个字段名只出现一次，响应体和序列化开销都明显小于逐条 dict
+    """
+    columns = list(items[0].keys()) if items else []
+    return {"columns": columns, "data": {c: [item.get(c) for item in items] for c in columns}}
+
+
+def _kline_payload(code: str, period: str, limit: int, adj: str, source: Optional[str],
+                   items: Optional[List[Dict[str, Any]]], layout: str) -> Dict[str, Any]:
+    """组装 K 线响应 data，A股与港美股、有数据与无数据时字段保持一致"""
+    items = items or []
+    return {
+        "code": code,
+        "period": period,
+        "limit": limit,
+        "adj": adj if adj else "none",
+        "source": source,
+        "items": _kline_columnar(items) if layout == "columnar" else items
+    }
+
+
 @router.get("/{code}/kline", response_model=dict)
 async def get_kline(
     code: str,
@@ -425,6 +488,7 @@ async def get_kline(
     limit: int = 120,
     adj: str = "none",
     force_refresh: bool = Query(False, description="是否强制刷新（跳过缓存）"),
+    layout: str = Query("records", pattern="^(records|columnar)$", description="items 结构：records=记录列表，columnar=列式"),
     current_user: dict = Depends(get_current_user)
 ):
     """
@@ -433,6 +497,7 @@ async def get_kline(
     period: day/week/month/5m/15m/30m/60m
     adj: none/qfq/hfq
     force_refresh: 是否强制刷新（跳过缓存）
+    layout: records（默认，逐条记录）/ columnar（{"columns", "data"} 列式结构，适合大区间）
 
     🔥 新增功能：当天实时K线数据
     - 交易时间内（09:30-15:00）：从 market_quotes 获取实时数据
@@ -459,12 +524,8 @@ async def get_kline(
 
         try:
             kline_data = await service.get_kline(market, normalized_code, period, limit, force_refresh)
-            return ok(data={
-                'code': normalized_code,
-                'period': period,
-                'items': kline_data,
-                'source': 'cache_or_api'
-            })
+            # ForeignStockService 不支持复权，adj 如实标记为 none
+            return ok(data=_kline_payload(normalized_code, period, limit, "none", 'cache_or_api', kline_data, layout))
         except Exception as e:
             logger.error(f"获取{market}股票{code}K线数据失败: {e}")
             raise HTTPException(
@@ -507,21 +568,11 @@ async def get_kline(
         start_date = (now - timedelta(days=limit * 2)).strftime("%Y-%m-%d")
 
         logger.info(f"🔍 尝试从 MongoDB 获取 K 线数据: {code_padded}, period={period} (MongoDB: {mongodb_period}), limit={limit}")
-        df = adapter.get_historical_data(code_padded, start_date, end_date, period=mongodb_period)
+        df = adapter.get_historical_data(code_padded, start_date, end_date, period=mongodb_period, limit=limit)
 
         if df is not None and not df.empty:
-            # 转换 DataFrame 为列表格式
-            items = []
-            for _, row in df.tail(limit).iterrows():
-                items.append({
-                    "time": row.get("trade_date", row.get("date", "")),  # 前端期望 time 字段
-                    "open": float(row.get("open", 0)),
-                    "high": float(row.get("high", 0)),
-                    "low": float(row.get("low", 0)),
-                    "close": float(row.get("close", 0)),
-                    "volume": float(row.get("volume", row.get("vol", 0))),
-                    "amount": float(row.get("amount", 0)) if "amount" in row else None,
-                })
+            # 转换 DataFrame 为列表格式（只在返回前按列组装一次）
+            items = _kline_items_from_frame(df)
             source = "mongodb"
             logger.info(f"✅ 从 MongoDB 获取到 {len(items)} 条 K 线数据")
     except Exception as e:
@@ -547,8 +598,12 @@ async def get_kline(
             logger.error(f"❌ 外部 API 获取 K 线失败: {e}")
             raise HTTPException(status_code=500, detail=f"获取K线数据失败: {str(e)}")
 
+    # 无历史数据（如无效代码探测）：直接返回空结果，不再查询当天实时行情
+    if not items:
+        return ok(_kline_payload(code_padded, period, limit, adj, source, items, layout))
+
     # 🔥 3. 检查是否需要添加当天实时数据（仅针对日线）
-    if period == "day" and items:
+    if period == "day":
         try:
             # 检查历史数据中是否已有当天的数据（支持两种日期格式）
             has_today_data = any(
@@ -610,15 +665,7 @@ async def get_kline(
         except Exception as e:
             logger.warning(f"⚠️ 获取当天实时数据失败（忽略）: {e}")
 
-    data = {
-        "code": code_padded,
-        "period": period,
-        "limit": limit,
-        "adj": adj if adj else "none",
-        "source": source,
-        "items": items or []
-    }
-    return ok(data)
+    return ok(_kline_payload(code_padded, period, limit, adj, source, items, layout))
 
 
 @router.get("/{code}/news", response_model=dict)
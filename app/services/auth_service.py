@@ -1,4 +1,6 @@
+import threading
 import time
+from collections import OrderedDict
 from datetime import datetime, timedelta, timezone
 from app.utils.timezone import now_tz
 from typing import Optional
@@ -10,6 +12,13 @@ class TokenData(BaseModel):
     sub: str
     exp: int
 
+# 已验证 token 的 LRU 缓存：(密钥, token) -> TokenData
+# 同一 token 在有效期内会被反复校验，命中时只需比较过期时间，省去 HMAC 签名校验
+_TOKEN_CACHE_MAX = 4096
+_token_cache: "OrderedDict[tuple, TokenData]" = OrderedDict()
+_token_cache_lock = threading.Lock()
+
+
 class AuthService:
     @staticmethod
     def create_access_token(sub: str, expires_minutes: int | None = None, expires_delta: int | None = None) -> str:
@@ -28,6 +37,19 @@ class AuthService:
         import logging
         logger = logging.getLogger(__name__)
 
+        cache_key = (settings.JWT_SECRET, settings.JWT_ALGORITHM, token)
+        with _token_cache_lock:
+            cached = _token_cache.get(cache_key)
+            if cached is not None:
+                # 与 PyJWT 一致：exp <= now 即视为过期
+                if cached.exp > int(time.time()):
+                    _token_cache.move_to_end(cache_key)
+                    return cached
+                del _token_cache[cache_key]
+        if cached is not None:
+            logger.warning(f"⏰ Token已过期: exp={cached.exp}")
+            return None
+
         try:
             logger.debug(f"🔍 开始验证token")
             logger.debug(f"📝 Token长度: {len(token)}")
@@ -48,6 +70,10 @@ class AuthService:
                 return None
 
             logger.debug(f"✅ Token验证成功")
+            with _token_cache_lock:
+                _token_cache[cache_key] = token_data
+                if len(_token_cache) > _TOKEN_CACHE_MAX:
+                    _token_cache.popitem(last=False)
             return token_data
 
         except jwt.ExpiredSignatureError:
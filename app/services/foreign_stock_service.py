@@ -723,9 +723,10 @@ class ForeignStockService:
 
             if cache_key:
                 cached_data = self.cache.load_stock_data(cache_key)
-                if cached_data:
+                kline_data = self._parse_cached_kline(cached_data) if cached_data is not None else []
+                if kline_data:
                     logger.info(f"⚡ 从缓存获取港股K线: {code}")
-                    return self._parse_cached_kline(cached_data)
+                    return kline_data
 
         # 2. 从数据库获取数据源优先级
         source_priority = await self._get_source_priority('HK')
@@ -778,7 +779,7 @@ class ForeignStockService:
         # 4. 保存到缓存
         self.cache.save_stock_data(
             symbol=code,
-            data=json.dumps(kline_data, ensure_ascii=False),
+            data=self._kline_to_frame(kline_data),
             data_source=cache_key_str
         )
         logger.info(f"💾 港股K线已缓存: {code}")
@@ -800,9 +801,10 @@ class ForeignStockService:
 
             if cache_key:
                 cached_data = self.cache.load_stock_data(cache_key)
-                if cached_data:
+                kline_data = self._parse_cached_kline(cached_data) if cached_data is not None else []
+                if kline_data:
                     logger.info(f"⚡ 从缓存获取美股K线: {code}")
-                    return self._parse_cached_kline(cached_data)
+                    return kline_data
 
         # 2. 从数据库获取数据源优先级
         source_priority = await self._get_source_priority('US')
@@ -855,7 +857,7 @@ class ForeignStockService:
         # 4. 保存到缓存
         self.cache.save_stock_data(
             symbol=code,
-            data=json.dumps(kline_data, ensure_ascii=False),
+            data=self._kline_to_frame(kline_data),
             data_source=cache_key_str
         )
         logger.info(f"💾 美股K线已缓存: {code}")
@@ -928,10 +930,27 @@ class ForeignStockService:
             # 返回空数据，触发重新获取
             return None
 
-    def _parse_cached_kline(self, cached_data: str) -> List[Dict]:
-        """解析缓存的K线数据"""
+    @staticmethod
+    def _kline_to_frame(kline_data: List[Dict]):
+        """
+        K线记录列表 -> 列式 DataFrame，用于写缓存
+
+        DataFrame 由缓存层按列存储（Parquet/pickle），比逐条重复字段名的 JSON 更小、解码更快
+        """
+        import pandas as pd
+
+        return pd.DataFrame.from_records(kline_data)
+
+    def _parse_cached_kline(self, cached_data) -> List[Dict]:
+        """解析缓存的K线数据（列式 DataFrame，或旧版的 JSON 字符串）"""
+        import pandas as pd
+
         try:
-            # 尝试解析JSON
+            if isinstance(cached_data, pd.DataFrame):
+                # 只在返回给调用方时才还原为记录列表
+                return cached_data.to_dict('records')
+
+            # 兼容旧缓存：尝试解析JSON
             if isinstance(cached_data, str):
                 data = json.loads(cached_data)
             else:
@@ -1034,6 +1053,53 @@ class ForeignStockService:
             'currency': profile.get('currency', 'USD'),
         }
 
+    # yfinance history() 返回的列名
+    _YF_KLINE_COLUMNS = {
+        'open': 'Open',
+        'high': 'High',
+        'low': 'Low',
+        'close': 'Close',
+        'volume': 'Volume',
+    }
+
+    @staticmethod
+    def _frame_to_kline(dates, df, columns: Dict[str, str]) -> List[Dict]:
+        """
+        按列批量将K线DataFrame转换为记录列表（替代逐行 iterrows + float()）
+
+        Args:
+            dates: 与 df 行对齐的日期字符串序列
+            df: 原始K线DataFrame
+            columns: 标准字段名 -> 原始列名（open/high/low/close/volume）
+
+        Returns:
+            K线记录列表，数值均为 Python 原生 float/int，可直接 JSON 序列化
+        """
+        import pandas as pd
+
+        # 价格列必须存在：缺列直接抛 KeyError，由调用方切换到下一个数据源，不能返回价格为 0 的K线；
+        # 价格列合并为单个 float64 块整体转换。只有成交量缺失时按 0 处理（一次 reindex 补列）
+        price_fields = ['open', 'high', 'low', 'close']
+        prices = df[[columns[f] for f in price_fields]].apply(pd.to_numeric).to_numpy(dtype='float64')
+        values = dict(zip(price_fields, prices.T.tolist()))
+        volume = df.reindex(columns=[columns['volume']], fill_value=0)[columns['volume']]
+        values['volume'] = pd.to_numeric(volume).astype('int64').tolist()
+
+        return [
+            {
+                'date': date_str,
+                'trade_date': date_str,  # 前端需要这个字段
+                'open': o,
+                'high': h,
+                'low': l,
+                'close': c,
+                'volume': v,
+            }
+            for date_str, o, h, l, c, v in zip(
+                list(dates), values['open'], values['high'], values['low'], values['close'], values['volume']
+            )
+        ]
+
     def _get_us_kline_from_yfinance(self, code: str, period: str, limit: int) -> List[Dict]:
         """从yfinance获取美股K线数据"""
         import yfinance as yf
@@ -1058,20 +1124,7 @@ class ForeignStockService:
             raise Exception("无数据")
 
         # 格式化数据
-        kline_data = []
-        for date, row in hist.iterrows():
-            date_str = date.strftime('%Y-%m-%d')
-            kline_data.append({
-                'date': date_str,
-                'trade_date': date_str,  # 前端需要这个字段
-                'open': float(row['Open']),
-                'high': float(row['High']),
-                'low': float(row['Low']),
-                'close': float(row['Close']),
-                'volume': int(row['Volume'])
-            })
-
-        return kline_data
+        return self._frame_to_kline(hist.index.strftime('%Y-%m-%d'), hist, self._YF_KLINE_COLUMNS)
 
     def _get_us_kline_from_alpha_vantage(self, code: str, period: str, limit: int) -> List[Dict]:
         """从Alpha Vantage获取美股K线数据"""
@@ -1116,20 +1169,13 @@ class ForeignStockService:
         df = df.head(limit)
 
         # 格式化数据
-        kline_data = []
-        for date, row in df.iterrows():
-            date_str = date.strftime('%Y-%m-%d')
-            kline_data.append({
-                'date': date_str,
-                'trade_date': date_str,  # 前端需要这个字段
-                'open': float(row['1. open']),
-                'high': float(row['2. high']),
-                'low': float(row['3. low']),
-                'close': float(row['4. close']),
-                'volume': int(row['5. volume'])
-            })
-
-        return kline_data
+        return self._frame_to_kline(df.index.strftime('%Y-%m-%d'), df, {
+            'open': '1. open',
+            'high': '2. high',
+            'low': '3. low',
+            'close': '4. close',
+            'volume': '5. volume',
+        })
 
     def _get_us_kline_from_finnhub(self, code: str, period: str, limit: int) -> List[Dict]:
         """从Finnhub获取美股K线数据"""
@@ -1684,21 +1730,15 @@ class ForeignStockService:
         df = df.tail(limit)
 
         # 格式化数据
-        kline_data = []
-        for _, row in df.iterrows():
-            # AKShare 返回的列名：date, open, close, high, low, volume
-            date_str = row['date'].strftime('%Y-%m-%d') if hasattr(row['date'], 'strftime') else str(row['date'])
-            kline_data.append({
-                'date': date_str,
-                'trade_date': date_str,
-                'open': float(row['open']),
-                'high': float(row['high']),
-                'low': float(row['low']),
-                'close': float(row['close']),
-                'volume': int(row['volume']) if 'volume' in row else 0
-            })
-
-        return kline_data
+        # AKShare 返回的列名：date, open, close, high, low, volume
+        dates = df['date'].map(lambda d: d.strftime('%Y-%m-%d') if hasattr(d, 'strftime') else str(d))
+        return self._frame_to_kline(dates, df, {
+            'open': 'open',
+            'high': 'high',
+            'low': 'low',
+            'close': 'close',
+            'volume': 'volume',
+        })
 
     def _get_hk_kline_from_yfinance(self, code: str, period: str, limit: int) -> List[Dict]:
         """从Yahoo Finance获取港股K线数据"""
@@ -1725,18 +1765,7 @@ class ForeignStockService:
             raise Exception("无数据")
 
         # 格式化数据
-        kline_data = []
-        for date, row in hist.iterrows():
-            date_str = date.strftime('%Y-%m-%d')
-            kline_data.append({
-                'date': date_str,
-                'trade_date': date_str,
-                'open': float(row['Open']),
-                'high': float(row['High']),
-                'low': float(row['Low']),
-                'close': float(row['Close']),
-                'volume': int(row['Volume'])
-            })
+        kline_data = self._frame_to_kline(hist.index.strftime('%Y-%m-%d'), hist, self._YF_KLINE_COLUMNS)
 
         return kline_data[-limit:]  # 返回最后limit条
 
@@ -7,6 +7,7 @@ import asyncio
 import logging
 from datetime import datetime, date
 from typing import Dict, Any, List, Optional, Union
+import numpy as np
 import pandas as pd
 from motor.motor_asyncio import AsyncIOMotorDatabase
 
@@ -14,6 +15,18 @@ from app.core.database import get_database
 
 logger = logging.getLogger(__name__)
 
+# 可选字段 -> 候选列（按优先级）
+_OPTIONAL_FIELDS = {
+    "turnover_rate": ("turnover_rate", "turn"),
+    "volume_ratio": ("volume_ratio",),
+    "pe": ("pe",),
+    "pb": ("pb",),
+    "ps": ("ps",),
+    "adjustflag": ("adjustflag", "adj_factor"),
+    "tradestatus": ("tradestatus",),
+    "isST": ("isST",),
+}
+
 
 class HistoricalDataService:
     """统一历史数据管理服务"""
@@ -127,45 +140,37 @@ class HistoricalDataService:
 
             # ⏱️ 性能监控：构建操作列表
             prepare_start = datetime.now()
+            # 整表标准化（按列转换，替代逐行 iterrows）
+            docs = self._standardize_frame(symbol, data, data_source, market, period)
+
             # 准备批量操作
+            from pymongo import ReplaceOne
             operations = []
             saved_count = 0
             batch_size = 200  # 进一步减小批量大小，避免超时（从500改为200）
 
-            for date_index, row in data.iterrows():
-                try:
-                    # 标准化数据（传递日期索引）
-                    doc = self._standardize_record(symbol, row, data_source, market, period, date_index)
-
-                    # 创建upsert操作
-                    filter_doc = {
-                        "symbol": doc["symbol"],
-                        "trade_date": doc["trade_date"],
-                        "data_source": doc["data_source"],
-                        "period": doc["period"]
-                    }
-
-                    from pymongo import ReplaceOne
-                    operations.append(ReplaceOne(
-                        filter=filter_doc,
-                        replacement=doc,
-                        upsert=True
-                    ))
-
-                    # 批量执行（每200条）
-                    if len(operations) >= batch_size:
-                        batch_write_start = datetime.now()
-                        batch_saved = await self._execute_bulk_write_with_retry(symbol, operations)
-                        batch_write_duration = (datetime.now() - batch_write_start).total_seconds()
-                        logger.debug(f"   批量写入 {len(operations)} 条，耗时 {batch_write_duration:.2f}秒")
-                        saved_count += batch_saved
-                        operations = []
-
-                except Exception as e:
-                    # 获取日期信息用于错误日志
-                    date_str = str(date_index) if hasattr(date_index, '__str__') else 'unknown'
-                    logger.error(f"❌ 处理记录失败 {symbol} {date_str}: {e}")
-                    continue
+            for doc in docs:
+                # 创建upsert操作
+                filter_doc = {
+                    "symbol": doc["symbol"],
+                    "trade_date": doc["trade_date"],
+                    "data_source": doc["data_source"],
+                    "period": doc["period"]
+                }
+                operations.append(ReplaceOne(
+                    filter=filter_doc,
+                    replacement=doc,
+                    upsert=True
+                ))
+
+                # 批量执行（每200条）
+                if len(operations) >= batch_size:
+                    batch_write_start = datetime.now()
+                    batch_saved = await self._execute_bulk_write_with_retry(symbol, operations)
+                    batch_write_duration = (datetime.now() - batch_write_start).total_seconds()
+                    logger.debug(f"   批量写入 {len(operations)} 条，耗时 {batch_write_duration:.2f}秒")
+                    saved_count += batch_saved
+                    operations = []
 
             prepare_duration = (datetime.now() - prepare_start).total_seconds()
 
@@ -245,88 +250,123 @@ class HistoricalDataService:
 
         return saved_count
 
-    def _standardize_record(
+    def _standardize_frame(
         self,
         symbol: str,
-        row: pd.Series,
+        data: pd.DataFrame,
         data_source: str,
         market: str,
-        period: str = "daily",
-        date_index = None
-    ) -> Dict[str, Any]:
-        """标准化单条记录"""
+        period: str = "daily"
+    ) -> List[Dict[str, Any]]:
+        """按列批量标准化整个DataFrame，每个数值列只做一次类型转换"""
         now = datetime.utcnow()
 
-        # 获取日期 - 优先从列中获取，如果索引是日期类型才使用索引
-        trade_date = None
+        trade_dates = self._format_trade_dates(data)
+        valid = trade_dates.notna()
+        if not valid.all():
+            logger.warning(f"⚠️ {symbol} 跳过 {int((~valid).sum())} 条日期无效的记录")
+
+        close = self._numeric_column(data, "close")
+        pre_close = self._numeric_column(data, "pre_close", "preclose")
+
+        columns = {
+            "open": self._numeric_column(data, "open"),
+            "high": self._numeric_column(data, "high"),
+            "low": self._numeric_column(data, "low"),
+            "close": close,
+            "pre_close": pre_close,
+            "volume": self._numeric_column(data, "volume", "vol"),
+            "amount": self._numeric_column(data, "amount", "turnover"),
+        }
 
-        # 先尝试从列中获取日期
-        date_from_column = row.get('date') or row.get('trade_date')
+        # 计算涨跌数据：收盘价与昨收都有效时重新计算，否则沿用原始列
+        # 直接在 float64 数组上原地计算，避免每一步都生成中间 Series
+        close_v = close.to_numpy()
+        pre_close_v = pre_close.to_numpy()
+        fallback = ~((close_v != 0) & (pre_close_v != 0) & ~np.isnan(close_v) & ~np.isnan(pre_close_v))
+        change = np.subtract(close_v, pre_close_v)
+        np.round(change, 4, out=change)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            pct_chg = np.divide(change, pre_close_v)
+        np.multiply(pct_chg, 100, out=pct_chg)
+        np.round(pct_chg, 4, out=pct_chg)
+        np.copyto(change, self._numeric_column(data, "change").to_numpy(), where=fallback)
+        np.copyto(pct_chg, self._numeric_column(data, "pct_chg", "change_percent").to_numpy(), where=fallback)
+        columns["change"] = change
+        columns["pct_chg"] = pct_chg
+
+        # 可选字段：仅当源数据含有对应列时写入
+        for key, names in _OPTIONAL_FIELDS.items():
+            if any(name in data.columns for name in names):
+                columns[key] = self._numeric_column(data, *names)
+
+        frame = pd.DataFrame(columns, index=data.index)[valid.to_numpy()]
+        values = frame.astype(object).where(frame.notna(), None).to_dict("records")
+
+        full_symbol = self._get_full_symbol(symbol, market)
+        docs = []
+        for trade_date, row in zip(trade_dates[valid.to_numpy()], values):
+            doc = {
+                "symbol": symbol,
+                "code": symbol,  # 添加 code 字段，与 symbol 保持一致（向后兼容）
+                "full_symbol": full_symbol,
+                "market": market,
+                "trade_date": trade_date,
+                "period": period,
+                "data_source": data_source,
+                "created_at": now,
+                "updated_at": now,
+                "version": 1
+            }
+            # OHLCV数据（单位转换已在 DataFrame 层面完成）
+            doc.update(row)
+            docs.append(doc)
+        return docs
+
+    def _numeric_column(self, data: pd.DataFrame, *names: str) -> pd.Series:
+        """
+        整列转为 float64，无法转换的值为 NaN
+
+        传入多个列名时按 `a or b` 语义取值：前一列为 0 或缺失时回退到后一列；
+        所有列都不存在时返回全 NaN 列
+        """
+        result = None
+        for name in reversed(names):
+            if name in data.columns:
+                values = pd.to_numeric(data[name], errors="coerce").astype("float64")
+            else:
+                values = pd.Series(np.nan, index=data.index)
+            if result is None:
+                result = values
+            else:
+                result = values.where(values.notna() & (values != 0), result)
+        return result
+
+    def _format_trade_dates(self, data: pd.DataFrame) -> pd.Series:
+        """
+        整列格式化交易日期为 YYYY-MM-DD，无效日期为 None
+
+        优先取 date/trade_date 列，其次是日期型索引，否则使用当天日期
+        """
+        raw = None
+        for name in ("trade_date", "date"):
+            if name in data.columns:
+                raw = data[name] if raw is None else data[name].where(data[name].notna(), raw)
+
+        if raw is None:
+            if pd.api.types.infer_dtype(data.index, skipna=True) in ("datetime64", "datetime", "date"):
+                raw = pd.Series(data.index, index=data.index)
+            else:
+                return pd.Series(self._format_date(None), index=data.index, dtype=object)
+
+        if pd.api.types.is_datetime64_dtype(raw):
+            # datetime64 列直接在 numpy 层格式化，不逐元素调用 strftime
+            formatted = np.datetime_as_string(raw.to_numpy(dtype="datetime64[D]"), unit="D")
+            return pd.Series(formatted, index=data.index, dtype=object).where(raw.notna(), None)
+        if pd.api.types.is_datetime64_any_dtype(raw):
+            return raw.dt.strftime("%Y-%m-%d").astype(object).where(raw.notna(), None)
+        return raw.map(lambda v: None if v is pd.NaT else self._format_date(v))
 
-        # 如果列中有日期，优先使用列中的日期
-        if date_from_column is not None:
-            trade_date = self._format_date(date_from_column)
-        # 如果列中没有日期，且索引是日期类型，才使用索引
-        elif date_index is not None and isinstance(date_index, (date, datetime, pd.Timestamp)):
-            trade_date = self._format_date(date_index)
-        # 否则使用当前日期
-        else:
-            trade_date = self._format_date(None)
-
-        # 基础字段映射
-        doc = {
-            "symbol": symbol,
-            "code": symbol,  # 添加 code 字段，与 symbol 保持一致（向后兼容）
-            "full_symbol": self._get_full_symbol(symbol, market),
-            "market": market,
-            "trade_date": trade_date,
-            "period": period,
-            "data_source": data_source,
-            "created_at": now,
-            "updated_at": now,
-            "version": 1
-        }
-        
-        # OHLCV数据（单位转换已在 DataFrame 层面完成）
-        amount_value = self._safe_float(row.get('amount') or row.get('turnover'))
-        volume_value = self._safe_float(row.get('volume') or row.get('vol'))
-
-        doc.update({
-            "open": self._safe_float(row.get('open')),
-            "high": self._safe_float(row.get('high')),
-            "low": self._safe_float(row.get('low')),
-            "close": self._safe_float(row.get('close')),
-            "pre_close": self._safe_float(row.get('pre_close') or row.get('preclose')),
-            "volume": volume_value,
-            "amount": amount_value
-        })
-        
-        # 计算涨跌数据
-        if doc["close"] and doc["pre_close"]:
-            doc["change"] = round(doc["close"] - doc["pre_close"], 4)
-            doc["pct_chg"] = round((doc["change"] / doc["pre_close"]) * 100, 4)
-        else:
-            doc["change"] = self._safe_float(row.get('change'))
-            doc["pct_chg"] = self._safe_float(row.get('pct_chg') or row.get('change_percent'))
-        
-        # 可选字段
-        optional_fields = {
-            "turnover_rate": row.get('turnover_rate') or row.get('turn'),
-            "volume_ratio": row.get('volume_ratio'),
-            "pe": row.get('pe'),
-            "pb": row.get('pb'),
-            "ps": row.get('ps'),
-            "adjustflag": row.get('adjustflag') or row.get('adj_factor'),
-            "tradestatus": row.get('tradestatus'),
-            "isST": row.get('isST')
-        }
-        
-        for key, value in optional_fields.items():
-            if value is not None:
-                doc[key] = self._safe_float(value)
-        
-        return doc
-    
     def _get_full_symbol(self, symbol: str, market: str) -> str:
         """生成完整股票代码"""
         if market == "CN":
@@ -95,7 +95,7 @@ def evaluate_conditions(
     # 叶子：字段比较
     field = node.get("field")
     op = node.get("op")
-    if field not in allowed_fields or op not in set(allowed_ops):
+    if field not in allowed_fields or op not in allowed_ops:
         return False
 
     # 需要最近两行（交叉）
@@ -157,11 +157,12 @@ def evaluate_conditions(
     return False
 
 
-def safe_float(v: Any) -> Optional[float]:
+def safe_float(v: Any, ndigits: Optional[int] = None) -> Optional[float]:
+    """转为 Python float，NaN/无法转换时返回 None；ndigits 用于抹掉 float32 指标转回 float 时的尾数噪声"""
     try:
-        if v is None or (isinstance(v, float) and np.isnan(v)):
+        if v is None or (isinstance(v, (float, np.floating)) and np.isnan(v)):
             return None
-        return float(v)
+        return float(v) if ndigits is None else round(float(v), ndigits)
     except Exception:
         return None
 
@@ -1,5 +1,9 @@
 from __future__ import annotations
 
+import asyncio
+import threading
+import time
+from collections import OrderedDict
 from dataclasses import dataclass
 from typing import Any, Dict, List, Optional, Tuple
 from datetime import datetime, timedelta
@@ -8,7 +12,7 @@ import pandas as pd
 import numpy as np
 
 # 统一指标库
-from tradingagents.tools.analysis.indicators import IndicatorSpec, compute_many
+from tradingagents.tools.analysis.indicators import IndicatorSpec, compute_many, compute_many_batch, last_values
 # 统一多数据源DF接口（按优先级降级）
 from tradingagents.dataflows.data_source_manager import get_data_source_manager
 from tradingagents.dataflows.providers.china.fundamentals_snapshot import get_cn_fund_snapshot
@@ -22,7 +26,7 @@ from app.services.screening.eval_utils import (
 )
 
 # --- DSL 约束 ---
-ALLOWED_FIELDS = {
+ALLOWED_FIELDS = frozenset({
     # 原始行情（统一为小写列）
     "open", "high", "low", "close", "vol", "amount",
     # 派生
@@ -37,11 +41,11 @@ ALLOWED_FIELDS = {
     "kdj_k", "kdj_d", "kdj_j",
     # 预留：基本面（后续实现）
     "pe", "pb", "roe", "market_cap",
-}
+})
 
 # 分类：基础行情字段、技术指标字段、基本面字段
-BASE_FIELDS = {"open", "high", "low", "close", "vol", "amount", "pct_chg"}
-TECH_FIELDS = {
+BASE_FIELDS = frozenset({"open", "high", "low", "close", "vol", "amount", "pct_chg"})
+TECH_FIELDS = frozenset({
     "ma5", "ma10", "ma20", "ma60",
     "ema12", "ema26",
     "dif", "dea", "macd_hist",
@@ -49,10 +53,58 @@ TECH_FIELDS = {
     "boll_mid", "boll_upper", "boll_lower",
     "atr14",
     "kdj_k", "kdj_d", "kdj_j",
-}
-FUND_FIELDS = {"pe", "pb", "roe", "market_cap"}
+})
+FUND_FIELDS = frozenset({"pe", "pb", "roe", "market_cap"})
+
+ALLOWED_OPS = frozenset({">", "<", ">=", "<=", "==", "!=", "between", "cross_up", "cross_down"})
+
+# 股票池缓存：(写入时间, 代码元组)，进程内所有筛选请求共享同一个不可变元组
+UNIVERSE_CACHE_TTL = 300.0
+_universe_cache: Optional[Tuple[float, Tuple[str, ...]]] = None
+# MongoDB 无数据或查询失败时的兜底股票列表
+_FALLBACK_UNIVERSE = ("000001", "000002", "000858", "600519", "600036", "601318", "300750")
+
+# 筛选使用的固定技术指标集合
+_TECH_SPECS = (
+    IndicatorSpec("ma", {"n": 5}),
+    IndicatorSpec("ma", {"n": 10}),
+    IndicatorSpec("ma", {"n": 20}),
+    IndicatorSpec("ema", {"n": 12}),
+    IndicatorSpec("ema", {"n": 26}),
+    IndicatorSpec("macd"),
+    IndicatorSpec("rsi", {"n": 14}),
+    IndicatorSpec("boll", {"n": 20, "k": 2}),
+    IndicatorSpec("atr", {"n": 14}),
+    IndicatorSpec("kdj", {"n": 9, "m1": 3, "m2": 3}),
+)
+
+# 筛选结果中返回的行情 / 技术指标字段
+_RESULT_BASE_FIELDS = ("close", "pct_chg", "amount")
+_RESULT_TECH_FIELDS = ("ma20", "rsi14", "kdj_k", "kdj_d", "kdj_j", "dif", "dea", "macd_hist")
+
+# 技术指标结果缓存：(code, start, end) -> (写入时间, 含指标的 DataFrame)
+# 窗口截止到当天，行情盘中会变化，因此只缓存很短时间；LRU 限制条目数
+INDICATOR_CACHE_TTL = 60.0
+INDICATOR_CACHE_MAXSIZE = 1024
+_indicator_cache: "OrderedDict[Tuple[str, str, str], Tuple[float, pd.DataFrame]]" = OrderedDict()
+_indicator_cache_lock = threading.Lock()
+
+
+def _get_cached_tech(key: Tuple[str, str, str]) -> Optional[pd.DataFrame]:
+    with _indicator_cache_lock:
+        hit = _indicator_cache.get(key)
+        if hit is not None and time.monotonic() - hit[0] < INDICATOR_CACHE_TTL:
+            _indicator_cache.move_to_end(key)
+            return hit[1]
+    return None
+
 
-ALLOWED_OPS = {">", "<", ">=", "<=", "==", "!=", "between", "cross_up", "cross_down"}
+def _put_cached_tech(key: Tuple[str, str, str], dfc: pd.DataFrame) -> None:
+    with _indicator_cache_lock:
+        _indicator_cache[key] = (time.monotonic(), dfc)
+        _indicator_cache.move_to_end(key)
+        while len(_indicator_cache) > INDICATOR_CACHE_MAXSIZE:
+            _indicator_cache.popitem(last=False)
 
 
 @dataclass
@@ -75,64 +127,121 @@ class ScreeningService:
 
     # --- 公共入口 ---
     def run(self, conditions: Dict[str, Any], params: ScreeningParams) -> Dict[str, Any]:
-        symbols = self._get_universe()
+        return self._screen(conditions, params)
+
+    async def run_async(self, conditions: Dict[str, Any], params: ScreeningParams) -> Dict[str, Any]:
+        """异步入口：并发预取全部K线，再在线程池中完成筛选，不阻塞事件循环"""
+        need_tech, need_base, _ = self._needed_data(conditions, params)
+        frames = None
+        if need_base:
+            start_s, end_s = self._date_window()
+            manager = get_data_source_manager()
+            frames = await manager.get_stock_dataframes_many(self._get_symbols(), start_s, end_s)
+            if need_tech and frames:
+                await self._warm_tech_cache(frames, start_s, end_s)
+        return await asyncio.to_thread(self._screen, conditions, params, frames)
+
+    async def _warm_tech_cache(self, frames: Dict[str, pd.DataFrame], start_s: str, end_s: str,
+                               batches: int = 4) -> None:
+        """按股票分批在线程池中并行计算技术指标并写入缓存，_screen 随后直接命中
+
+        每批内用 compute_many_batch 按 (交易日, 股票) 矩阵一次算出收盘价类指标；
+        NumPy/pandas 的向量运算会释放 GIL，多批之间可以重叠执行
+        """
+        items = [(code, df) for code, df in frames.items() if df is not None and not df.empty]
+
+        def work(batch: List[Tuple[str, pd.DataFrame]]) -> None:
+            prepared = {}
+            for code, df in batch:
+                if _get_cached_tech((code, start_s, end_s)) is None:
+                    prepared[code] = self._prepare_frame(df)
+            if not prepared:
+                return
+            try:
+                computed = compute_many_batch(prepared, list(_TECH_SPECS), dtype=np.float32)
+            except Exception:
+                # 整批失败时退回逐只计算，单只异常在 _screen 中照常跳过
+                for code, dfu in prepared.items():
+                    try:
+                        self._compute_tech(code, dfu, start_s, end_s)
+                    except Exception:
+                        continue
+                return
+            for code, dfc in computed.items():
+                _put_cached_tech((code, start_s, end_s), dfc)
+
+        await asyncio.gather(*(asyncio.to_thread(work, items[i::batches]) for i in range(batches)))
+
+    @staticmethod
+    def _prepare_frame(df: pd.DataFrame) -> pd.DataFrame:
+        """统一列名为小写并补充派生字段 pct_chg"""
+        # rename 本身返回新对象，在其上添加列不会影响调用方（缓存）中的 df，无需再 copy 一次
+        dfu = df.rename(columns={
+            "Open": "open", "High": "high", "Low": "low", "Close": "close",
+            "Volume": "vol", "Amount": "amount"
+        })
+        if "close" in dfu.columns:
+            dfu["pct_chg"] = dfu["close"].pct_change() * 100.0
+        return dfu
+
+    def _get_symbols(self) -> List[str]:
         # 为控制时长，先限制样本规模（后续用批量/缓存优化）
-        symbols = symbols[:120]
+        return list(self._get_universe()[:120])
 
+    def _date_window(self) -> Tuple[str, str]:
         end_date = datetime.now()
         start_date = end_date - timedelta(days=220)
-        end_s = end_date.strftime("%Y-%m-%d")
-        start_s = start_date.strftime("%Y-%m-%d")
-
-        results: List[Dict[str, Any]] = []
+        return start_date.strftime("%Y-%m-%d"), end_date.strftime("%Y-%m-%d")
 
-        # 解析条件中涉及的字段，决定是否需要技术指标/行情
+    def _needed_data(self, conditions: Dict[str, Any], params: ScreeningParams) -> Tuple[bool, bool, bool]:
+        """解析条件中涉及的字段，决定是否需要技术指标/行情/基本面"""
         needed_fields = self._collect_fields_from_conditions(conditions)
         order_fields = {o.get("field") for o in (params.order_by or []) if o.get("field")}
         all_needed = set(needed_fields) | set(order_fields)
         need_tech = any(f in TECH_FIELDS for f in all_needed)
         need_base = any(f in BASE_FIELDS for f in all_needed) or need_tech
         need_fund = any(f in FUND_FIELDS for f in all_needed)
+        return need_tech, need_base, need_fund
+
+    def _screen(
+        self,
+        conditions: Dict[str, Any],
+        params: ScreeningParams,
+        frames: Optional[Dict[str, pd.DataFrame]] = None,
+    ) -> Dict[str, Any]:
+        """执行筛选；frames 为预取的K线（symbol -> DataFrame），为 None 时逐只同步获取"""
+        symbols = self._get_symbols()
+        start_s, end_s = self._date_window()
+
+        results: List[Dict[str, Any]] = []
+
+        need_tech, need_base, need_fund = self._needed_data(conditions, params)
 
         for code in symbols:
             try:
                 dfc = None
-                last = None
 
                 # 如需要基础行情/技术指标才取K线
                 if need_base:
-                    manager = get_data_source_manager()
-                    df = manager.get_stock_dataframe(code, start_s, end_s)
-                    if df is None or df.empty:
-                        continue
-                    # 统一列为小写
-                    dfu = df.rename(columns={
-                        "Open": "open", "High": "high", "Low": "low", "Close": "close",
-                        "Volume": "vol", "Amount": "amount"
-                    }).copy()
-                    # 计算派生：pct_chg
-                    if "close" in dfu.columns:
-                        dfu["pct_chg"] = dfu["close"].pct_change() * 100.0
-
-                    # 仅在需要技术指标时计算
+                    # 指标缓存命中时直接使用，跳过取K线与整理列
                     if need_tech:
-                        specs = [
-                            IndicatorSpec("ma", {"n": 5}),
-                            IndicatorSpec("ma", {"n": 10}),
-                            IndicatorSpec("ma", {"n": 20}),
-                            IndicatorSpec("ema", {"n": 12}),
-                            IndicatorSpec("ema", {"n": 26}),
-                            IndicatorSpec("macd"),
-                            IndicatorSpec("rsi", {"n": 14}),
-                            IndicatorSpec("boll", {"n": 20, "k": 2}),
-                            IndicatorSpec("atr", {"n": 14}),
-                            IndicatorSpec("kdj", {"n": 9, "m1": 3, "m2": 3}),
-                        ]
-                        dfc = compute_many(dfu, specs)
-                    else:
-                        dfc = dfu
-
-                    last = dfc.iloc[-1]
+                        dfc = _get_cached_tech((code, start_s, end_s))
+                    if dfc is None:
+                        if frames is not None:
+                            df = frames.get(code)
+                        else:
+                            manager = get_data_source_manager()
+                            df = manager.get_stock_dataframe(code, start_s, end_s)
+                        if df is None or df.empty:
+                            continue
+                        # 统一列为小写，并计算派生字段 pct_chg
+                        dfu = self._prepare_frame(df)
+
+                        # 仅在需要技术指标时计算
+                        if need_tech:
+                            dfc = self._compute_tech(code, dfu, start_s, end_s)
+                        else:
+                            dfc = dfu
 
                 # 评估条件（若条件完全是基本面且不涉及行情/技术，这里可跳过K线）
                 passes = True
@@ -148,20 +257,14 @@ class ScreeningService:
 
                 if passes:
                     item = {"code": code}
-                    if last is not None:
-                        item.update({
-                            "close": self._safe_float(last.get("close")),
-                            "pct_chg": self._safe_float(last.get("pct_chg")),
-                            "amount": self._safe_float(last.get("amount")),
-                            "ma20": self._safe_float(last.get("ma20")) if need_tech else None,
-                            "rsi14": self._safe_float(last.get("rsi14")) if need_tech else None,
-                            "kdj_k": self._safe_float(last.get("kdj_k")) if need_tech else None,
-                            "kdj_d": self._safe_float(last.get("kdj_d")) if need_tech else None,
-                            "kdj_j": self._safe_float(last.get("kdj_j")) if need_tech else None,
-                            "dif": self._safe_float(last.get("dif")) if need_tech else None,
-                            "dea": self._safe_float(last.get("dea")) if need_tech else None,
-                            "macd_hist": self._safe_float(last.get("macd_hist")) if need_tech else None,
-                        })
+                    if dfc is not None:
+                        # 只对通过筛选的股票取最后一行，且只切出需要返回的列
+                        last = last_values(dfc, _RESULT_BASE_FIELDS + _RESULT_TECH_FIELDS)
+                        for f in _RESULT_BASE_FIELDS:
+                            item[f] = self._safe_float(last[f])
+                        # 指标列为 float32，保留 4 位小数，避免输出 10.010000228 这类尾数
+                        for f in _RESULT_TECH_FIELDS:
+                            item[f] = self._safe_float(last[f], 4) if need_tech else None
                     results.append(item)
             except Exception:
                 continue
@@ -184,6 +287,19 @@ class ScreeningService:
             "total": total,
             "items": page_items,
         }
+
+    def _compute_tech(self, code: str, dfu: pd.DataFrame, start_s: str, end_s: str) -> pd.DataFrame:
+        """计算筛选用技术指标；同一股票同一窗口在 INDICATOR_CACHE_TTL 内直接复用上次结果"""
+        key = (code, start_s, end_s)
+        dfc = _get_cached_tech(key)
+        if dfc is not None:
+            return dfc
+
+        # 指标仅用于条件判断和取最新值，使用 float32 减少批量筛选的内存占用
+        dfc = compute_many(dfu, list(_TECH_SPECS), dtype=np.float32)
+        _put_cached_tech(key, dfc)
+        return dfc
+
     def _evaluate_fund_conditions(self, snap: Dict[str, Any], node: Dict[str, Any]) -> bool:
         """Delegate fundamental condition evaluation to utils to keep service slim."""
         return _evaluate_fund_conditions_util(snap, node, FUND_FIELDS)
@@ -199,12 +315,17 @@ class ScreeningService:
         return _evaluate_conditions_util(df, node, ALLOWED_FIELDS, ALLOWED_OPS)
 
     # --- 工具 ---
-    def _safe_float(self, v: Any) -> Optional[float]:
+    def _safe_float(self, v: Any, ndigits: Optional[int] = None) -> Optional[float]:
         """Delegate numeric coercion to utils."""
-        return _safe_float_util(v)
+        return _safe_float_util(v, ndigits)
+
+    def _get_universe(self) -> Tuple[str, ...]:
+        """获取A股代码集合：从 MongoDB stock_basic_info 集合获取所有A股股票代码（短期缓存）"""
+        global _universe_cache
+        cached = _universe_cache
+        if cached is not None and time.monotonic() - cached[0] < UNIVERSE_CACHE_TTL:
+            return cached[1]
 
-    def _get_universe(self) -> List[str]:
-        """获取A股代码集合：从 MongoDB stock_basic_info 集合获取所有A股股票代码"""
         try:
             from app.core.database import get_mongo_db
 
@@ -224,18 +345,19 @@ class ScreeningService:
             )
 
             # 同步获取所有股票代码
-            codes = [doc.get("code") for doc in cursor if doc.get("code")]
+            codes = tuple(code for code in (doc.get("code") for doc in cursor) if code)
 
             if codes:
                 logger.info(f"📊 从 MongoDB 获取到 {len(codes)} 只A股股票")
+                _universe_cache = (time.monotonic(), codes)
                 return codes
             else:
                 # 如果数据库为空，返回常见股票代码作为兜底
                 logger.warning("⚠️ MongoDB 中未找到股票数据，使用兜底股票列表")
-                return ["000001", "000002", "000858", "600519", "600036", "601318", "300750"]
+                return _FALLBACK_UNIVERSE
 
         except Exception as e:
             logger.error(f"❌ 从 MongoDB 获取股票列表失败: {e}")
             # 异常时返回常见股票代码作为兜底
-            return ["000001", "000002", "000858", "600519", "600036", "601318", "300750"]
+            return _FALLBACK_UNIVERSE
 
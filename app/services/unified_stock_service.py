@@ -16,6 +16,7 @@
 """
 
 import logging
+import re
 from typing import Dict, List, Optional
 from motor.motor_asyncio import AsyncIOMotorDatabase
 
@@ -177,11 +178,14 @@ class UnifiedStockService:
         collection = self.db[collection_name]
 
         # 支持代码和名称搜索
+        # 关键词按字面量匹配：转义正则元字符后 MongoDB 走纯子串扫描，
+        # 也避免 "*ST" 这类名称关键词被当作非法正则报错
+        pattern = re.escape(query)
         filter_query = {
             "$or": [
-                {"code": {"$regex": query, "$options": "i"}},
-                {"name": {"$regex": query, "$options": "i"}},
-                {"name_en": {"$regex": query, "$options": "i"}}
+                {"code": {"$regex": pattern, "$options": "i"}},
+                {"name": {"$regex": pattern, "$options": "i"}},
+                {"name_en": {"$regex": pattern, "$options": "i"}}
             ]
         }
 
@@ -194,24 +198,25 @@ class UnifiedStockService:
         
         # 按 code 分组，每个 code 只保留优先级最高的数据源
         source_priority = await self._get_source_priority(market)
+        # 预先建立 source -> 排名 的映射，避免每条记录都 list.index 线性查找
+        source_rank = {src: i for i, src in enumerate(source_priority)}
         unique_results = {}
         
         for doc in all_results:
             code = doc.get("code")
-            source = doc.get("source")
+            current = unique_results.get(code)
             
-            if code not in unique_results:
+            if current is None:
+                # 只返回前 limit 个 code，之后出现的新 code 无需保留
+                if len(unique_results) < limit:
+                    unique_results[code] = doc
+                continue
+
+            # 比较优先级（source 不在优先级列表中时保持当前记录）
+            rank = source_rank.get(doc.get("source"))
+            current_rank = source_rank.get(current.get("source"))
+            if rank is not None and current_rank is not None and rank < current_rank:
                 unique_results[code] = doc
-            else:
-                # 比较优先级
-                current_source = unique_results[code].get("source")
-                try:
-                    if source in source_priority and current_source in source_priority:
-                        if source_priority.index(source) < source_priority.index(current_source):
-                            unique_results[code] = doc
-                except ValueError:
-                    # 如果source不在优先级列表中，保持当前记录
-                    pass
         
         # 返回前 limit 条
         result_list = list(unique_results.values())[:limit]
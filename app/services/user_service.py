@@ -2,10 +2,13 @@
 用户服务 - 基于数据库的用户管理
 """
 
+import asyncio
 import hashlib
+import hmac
 import time
 from datetime import datetime
-from typing import Optional, Dict, Any, List
+from typing import Optional, Dict, Any, List, Tuple
+import bcrypt
 from pymongo import MongoClient
 from bson import ObjectId
 
@@ -27,10 +30,19 @@ logger = get_logger('user_service')
 class UserService:
     """用户服务类"""
 
+    # 按用户名查询用户的短时缓存（秒）：每个认证请求都会查一次用户，
+    # 缓存可吸收同一用户的突发请求，本服务内的写操作会立即失效对应条目
+    USER_CACHE_TTL = 5.0
+
     def __init__(self):
         self.client = MongoClient(settings.MONGO_URI)
         self.db = self.client[settings.MONGO_DB]
         self.users_collection = self.db.users
+        self._user_cache: Dict[str, Tuple[float, User]] = {}
+
+    def _invalidate_user(self, username: str):
+        """使用户缓存失效"""
+        self._user_cache.pop(username, None)
 
     def close(self):
         """关闭数据库连接"""
@@ -42,16 +54,33 @@ class UserService:
         """析构函数，确保连接被关闭"""
         self.close()
     
+    @staticmethod
+    def _bcrypt_input(password: str) -> bytes:
+        """bcrypt 只使用前 72 字节，显式截断以兼容新版 bcrypt 对超长输入的报错"""
+        return password.encode()[:72]
+
+    @staticmethod
+    def is_legacy_hash(hashed_password: str) -> bool:
+        """是否为旧版无盐 SHA-256 哈希（bcrypt 哈希以 $2 开头）"""
+        return not hashed_password.startswith("$2")
+
     @staticmethod
     def hash_password(password: str) -> str:
-        """密码哈希"""
-        # 使用 bcrypt 会更安全，但为了兼容性先使用 SHA-256
-        return hashlib.sha256(password.encode()).hexdigest()
+        """密码哈希（bcrypt，自带随机盐）"""
+        return bcrypt.hashpw(UserService._bcrypt_input(password), bcrypt.gensalt()).decode()
     
     @staticmethod
     def verify_password(plain_password: str, hashed_password: str) -> bool:
-        """验证密码"""
-        return UserService.hash_password(plain_password) == hashed_password
+        """验证密码，兼容旧版 SHA-256 哈希"""
+        if not hashed_password:
+            return False
+        if UserService.is_legacy_hash(hashed_password):
+            legacy_hash = hashlib.sha256(plain_password.encode()).hexdigest()
+            return hmac.compare_digest(legacy_hash, hashed_password)
+        try:
+            return bcrypt.checkpw(UserService._bcrypt_input(plain_password), hashed_password.encode())
+        except ValueError:
+            return False
     
     async def create_user(self, user_data: UserCreate) -> Optional[User]:
         """创建用户"""
@@ -72,7 +101,7 @@ class UserService:
             user_doc = {
                 "username": user_data.username,
                 "email": user_data.email,
-                "hashed_password": self.hash_password(user_data.password),
+                "hashed_password": await asyncio.to_thread(self.hash_password, user_data.password),
                 "is_active": True,
                 "is_verified": False,
                 "is_admin": False,
@@ -131,15 +160,9 @@ class UserService:
 
             logger.info(f"🔍 [authenticate_user] 用户信息: username={user_doc.get('username')}, email={user_doc.get('email')}, is_active={user_doc.get('is_active')}")
 
-            # 验证密码
-            input_password_hash = self.hash_password(password)
+            # 验证密码（bcrypt 计算较慢，放到线程中执行，不阻塞事件循环）
             stored_password_hash = user_doc["hashed_password"]
-            logger.info(f"🔍 [authenticate_user] 密码哈希对比:")
-            logger.info(f"   输入密码哈希: {input_password_hash[:20]}...")
-            logger.info(f"   存储密码哈希: {stored_password_hash[:20]}...")
-            logger.info(f"   哈希匹配: {input_password_hash == stored_password_hash}")
-
-            if not self.verify_password(password, user_doc["hashed_password"]):
+            if not await asyncio.to_thread(self.verify_password, password, stored_password_hash):
                 logger.warning(f"❌ [authenticate_user] 密码错误: {username}")
                 return None
 
@@ -148,11 +171,17 @@ class UserService:
                 logger.warning(f"❌ [authenticate_user] 用户已禁用: {username}")
                 return None
 
-            # 更新最后登录时间
+            # 更新最后登录时间；旧版 SHA-256 哈希顺便升级为 bcrypt
+            login_update = {"last_login": datetime.utcnow()}
+            if self.is_legacy_hash(stored_password_hash):
+                login_update["hashed_password"] = await asyncio.to_thread(self.hash_password, password)
+                user_doc["hashed_password"] = login_update["hashed_password"]
+                logger.info(f"🔐 [authenticate_user] 密码哈希已升级为 bcrypt: {username}")
             self.users_collection.update_one(
                 {"_id": user_doc["_id"]},
-                {"$set": {"last_login": datetime.utcnow()}}
+                {"$set": login_update}
             )
+            self._invalidate_user(username)
 
             logger.info(f"✅ [authenticate_user] 用户认证成功: {username}")
             return User(**user_doc)
@@ -163,10 +192,16 @@ class UserService:
     
     async def get_user_by_username(self, username: str) -> Optional[User]:
         """根据用户名获取用户"""
+        cached = self._user_cache.get(username)
+        if cached is not None and time.monotonic() - cached[0] < self.USER_CACHE_TTL:
+            return cached[1]
         try:
             user_doc = self.users_collection.find_one({"username": username})
             if user_doc:
-                return User(**user_doc)
+                user = User(**user_doc)
+                self._user_cache[username] = (time.monotonic(), user)
+                return user
+            self._invalidate_user(username)
             return None
         except Exception as e:
             logger.error(f"❌ 获取用户失败: {e}")
@@ -216,6 +251,7 @@ class UserService:
                 {"username": username},
                 {"$set": update_data}
             )
+            self._invalidate_user(username)
             
             if result.modified_count > 0:
                 logger.info(f"✅ 用户信息更新成功: {username}")
@@ -238,7 +274,7 @@ class UserService:
                 return False
             
             # 更新密码
-            new_hashed_password = self.hash_password(new_password)
+            new_hashed_password = await asyncio.to_thread(self.hash_password, new_password)
             result = self.users_collection.update_one(
                 {"username": username},
                 {
@@ -248,6 +284,7 @@ class UserService:
                     }
                 }
             )
+            self._invalidate_user(username)
             
             if result.modified_count > 0:
                 logger.info(f"✅ 密码修改成功: {username}")
@@ -263,7 +300,7 @@ class UserService:
     async def reset_password(self, username: str, new_password: str) -> bool:
         """重置密码（管理员操作）"""
         try:
-            new_hashed_password = self.hash_password(new_password)
+            new_hashed_password = await asyncio.to_thread(self.hash_password, new_password)
             result = self.users_collection.update_one(
                 {"username": username},
                 {
@@ -273,6 +310,7 @@ class UserService:
                     }
                 }
             )
+            self._invalidate_user(username)
             
             if result.modified_count > 0:
                 logger.info(f"✅ 密码重置成功: {username}")
@@ -298,7 +336,7 @@ class UserService:
             admin_doc = {
                 "username": username,
                 "email": email,
-                "hashed_password": self.hash_password(password),
+                "hashed_password": await asyncio.to_thread(self.hash_password, password),
                 "is_active": True,
                 "is_verified": True,
                 "is_admin": True,
@@ -376,6 +414,7 @@ class UserService:
                     }
                 }
             )
+            self._invalidate_user(username)
             
             if result.modified_count > 0:
                 logger.info(f"✅ 用户已禁用: {username}")
@@ -400,6 +439,7 @@ class UserService:
                     }
                 }
             )
+            self._invalidate_user(username)
             
             if result.modified_count > 0:
                 logger.info(f"✅ 用户已激活: {username}")
@@ -0,0 +1,28 @@
+import pandas as pd
+
+
+def test_screen_uses_cached_tech_without_preparing_frame(monkeypatch):
+    import app.services.screening_service as mod
+    from app.services.screening_service import ScreeningParams, ScreeningService
+
+    svc = ScreeningService()
+    monkeypatch.setattr(svc, "_get_symbols", lambda: ["000001"])
+    monkeypatch.setattr(svc, "_date_window", lambda: ("2024-01-01", "2024-08-01"))
+    monkeypatch.setattr(mod, "_indicator_cache", mod.OrderedDict())
+
+    def _fail_prepare(_df):
+        raise AssertionError("cache hit should not prepare the frame")
+
+    monkeypatch.setattr(ScreeningService, "_prepare_frame", staticmethod(_fail_prepare))
+
+    cached = pd.DataFrame({"close": [10.0, 10.5], "pct_chg": [None, 5.0], "amount": [1e6, 2e6],
+                           "ma20": [9.8, 10.1]})
+    mod._put_cached_tech(("000001", "2024-01-01", "2024-08-01"), cached)
+
+    raw = pd.DataFrame({"Close": [10.0, 10.5]})
+    conditions = {"field": "close", "op": ">", "right_field": "ma20"}
+    out = svc._screen(conditions, ScreeningParams(), frames={"000001": raw})
+
+    assert out["total"] == 1
+    assert out["items"][0]["code"] == "000001"
+    assert out["items"][0]["ma20"] == 10.1
@@ -1,27 +1,32 @@
 import io
 import json
 import logging
+import pytest
 from fastapi.testclient import TestClient
 
 from app.main import app
 from app.services.auth_service import AuthService
 
 
-def _auth_headers() -> dict:
+@pytest.fixture(scope="module")
+def client():
+    return TestClient(app)
+
+
+@pytest.fixture(scope="module")
+def auth_headers() -> dict:
+    # 令牌只签发一次，本模块内各用例共用
     token = AuthService.create_access_token(sub="admin")
     return {"Authorization": f"Bearer {token}"}
 
 
-def test_config_summary_requires_auth():
-    client = TestClient(app)
+def test_config_summary_requires_auth(client):
     resp = client.get("/api/system/config/summary")
     assert resp.status_code == 401
 
 
-def test_config_summary_masks_sensitive_fields_with_auth():
-    client = TestClient(app)
-
-    resp = client.get("/api/system/config/summary", headers=_auth_headers())
+def test_config_summary_masks_sensitive_fields_with_auth(client, auth_headers):
+    resp = client.get("/api/system/config/summary", headers=auth_headers)
     assert resp.status_code == 200
     data = resp.json()
 
@@ -0,0 +1,96 @@
+from datetime import datetime, timedelta
+from unittest import mock
+
+from tradingagents.dataflows.cache import adaptive
+from tradingagents.dataflows.cache.adaptive import AdaptiveCacheSystem
+
+
+def make_cache(tmp_path, primary_backend="mongodb"):
+    manager = mock.MagicMock()
+    manager.get_config.return_value = {"cache": {"primary_backend": primary_backend, "fallback_enabled": False}}
+    with mock.patch.object(adaptive, "get_database_manager", return_value=manager):
+        cache = AdaptiveCacheSystem(cache_dir=str(tmp_path))
+    return cache, manager
+
+
+def test_mongodb_doc_marks_utc_expiry():
+    doc = AdaptiveCacheSystem._build_mongodb_doc("k", {"a": 1}, {}, 60)
+    assert doc["expires_at_utc"] is True
+    assert doc["expires_at"] > datetime.utcnow()
+
+
+def test_mongodb_load_skips_legacy_local_time_docs(tmp_path):
+    cache, manager = make_cache(tmp_path)
+    collection = manager.get_mongodb_client.return_value.tradingagents.cache
+
+    # 旧版文档：expires_at 为本地时间且无 UTC 标记，不能再被读取
+    legacy = AdaptiveCacheSystem._build_mongodb_doc("k", {"a": 1}, {}, 60)
+    legacy.pop("expires_at_utc")
+    collection.find_one.return_value = legacy
+    assert cache._load_from_mongodb("k") is None
+
+    collection.find_one.return_value = AdaptiveCacheSystem._build_mongodb_doc("k", {"a": 1}, {}, 60)
+    assert cache._load_from_mongodb("k")["data"] == {"a": 1}
+
+
+def test_mongodb_load_rejects_expired_utc_doc(tmp_path):
+    cache, manager = make_cache(tmp_path)
+    collection = manager.get_mongodb_client.return_value.tradingagents.cache
+    collection.find_one.return_value = AdaptiveCacheSystem._build_mongodb_doc(
+        "k", {"a": 1}, {}, 60, utc_now=datetime.utcnow() - timedelta(seconds=120)
+    )
+    assert cache._load_from_mongodb("k") is None
+
+
+def test_clear_expired_cache_purges_legacy_mongodb_docs(tmp_path):
+    cache, manager = make_cache(tmp_path)
+    collection = manager.get_mongodb_client.return_value.tradingagents.cache
+    cache.clear_expired_cache()
+    collection.delete_many.assert_called_once_with({"expires_at_utc": {"$exists": False}})
+
+
+def _l0_ttl(cache, key):
+    import time
+    expires_at, _ = cache.memory_cache._store[key]
+    return expires_at - time.monotonic()
+
+
+def test_l0_keeps_only_remaining_life_of_file_entry(tmp_path):
+    cache, _ = make_cache(tmp_path, primary_backend="file")
+    # TTL 3600 秒、已写入 3590 秒：L0 只能再保留约 10 秒
+    entry = {
+        "data": {"a": 1},
+        "metadata": {"ttl_seconds": 3600},
+        "timestamp": datetime.now() - timedelta(seconds=3590),
+        "backend": "file",
+    }
+    assert cache._unwrap_cache_data("k", entry) == {"a": 1}
+    assert 0 < _l0_ttl(cache, "k") <= 10
+
+
+def test_l0_skips_expired_file_entry(tmp_path):
+    cache, _ = make_cache(tmp_path, primary_backend="file")
+    entry = {
+        "data": {"a": 1},
+        "metadata": {"ttl_seconds": 60},
+        "timestamp": datetime.now() - timedelta(seconds=61),
+        "backend": "file",
+    }
+    assert cache._unwrap_cache_data("k", entry) is None
+    assert "k" not in cache.memory_cache._store
+
+
+def test_l0_redis_entry_capped_and_unknown_time_not_cached(tmp_path):
+    cache, _ = make_cache(tmp_path, primary_backend="redis")
+    fresh = {"data": {"a": 1}, "metadata": {"ttl_seconds": 3600}, "timestamp": datetime.now(), "backend": "redis"}
+    assert cache._unwrap_cache_data("fresh", fresh) == {"a": 1}
+    assert _l0_ttl(cache, "fresh") <= adaptive.MEMORY_CACHE_TTL
+
+    nearly = dict(fresh, timestamp=datetime.now() - timedelta(seconds=3595))
+    cache._unwrap_cache_data("nearly", nearly)
+    assert _l0_ttl(cache, "nearly") <= 5
+
+    # 写入时间未知：剩余有效期无法确定，不放入 L0
+    unknown = dict(fresh, timestamp=None)
+    assert cache._unwrap_cache_data("unknown", unknown) == {"a": 1}
+    assert "unknown" not in cache.memory_cache._store
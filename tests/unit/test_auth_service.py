@@ -0,0 +1,75 @@
+import pytest
+
+import app.services.auth_service as auth_mod
+from app.core.config import settings
+from app.services.auth_service import AuthService
+
+
+@pytest.fixture(autouse=True)
+def clear_token_cache():
+    auth_mod._token_cache.clear()
+    yield
+    auth_mod._token_cache.clear()
+
+
+@pytest.fixture
+def decode_calls(monkeypatch):
+    calls = []
+    real_decode = auth_mod.jwt.decode
+
+    def spy(*args, **kwargs):
+        calls.append(args[0])
+        return real_decode(*args, **kwargs)
+
+    monkeypatch.setattr(auth_mod.jwt, "decode", spy)
+    return calls
+
+
+def test_second_verify_served_from_cache(decode_calls):
+    token = AuthService.create_access_token("alice", expires_minutes=5)
+    first = AuthService.verify_token(token)
+    second = AuthService.verify_token(token)
+    assert first is not None and first.sub == "alice"
+    assert second == first
+    assert decode_calls == [token]
+
+
+def test_cached_token_expires_at_exp(monkeypatch, decode_calls):
+    token = AuthService.create_access_token("alice", expires_minutes=5)
+    data = AuthService.verify_token(token)
+    assert len(auth_mod._token_cache) == 1
+
+    # exp == now：与 PyJWT 一样视为过期，并从缓存中移除
+    monkeypatch.setattr(auth_mod.time, "time", lambda: float(data.exp))
+    assert AuthService.verify_token(token) is None
+    assert len(auth_mod._token_cache) == 0
+    assert decode_calls == [token]
+
+
+def test_secret_change_misses_cache(monkeypatch, decode_calls):
+    token = AuthService.create_access_token("alice", expires_minutes=5)
+    assert AuthService.verify_token(token) is not None
+
+    monkeypatch.setattr(settings, "JWT_SECRET", settings.JWT_SECRET + "-rotated")
+    assert AuthService.verify_token(token) is None
+    assert decode_calls == [token, token]
+
+
+def test_algorithm_change_misses_cache(monkeypatch, decode_calls):
+    token = AuthService.create_access_token("alice", expires_minutes=5)
+    assert AuthService.verify_token(token) is not None
+
+    monkeypatch.setattr(settings, "JWT_ALGORITHM", "HS512")
+    assert AuthService.verify_token(token) is None
+    assert decode_calls == [token, token]
+
+
+def test_token_cache_is_bounded(monkeypatch):
+    monkeypatch.setattr(auth_mod, "_TOKEN_CACHE_MAX", 3)
+    tokens = [AuthService.create_access_token(f"user{i}", expires_minutes=5) for i in range(5)]
+    for token in tokens:
+        assert AuthService.verify_token(token) is not None
+
+    assert len(auth_mod._token_cache) == 3
+    cached_tokens = [key[-1] for key in auth_mod._token_cache]
+    assert cached_tokens == tokens[2:]
@@ -0,0 +1,35 @@
+import pandas as pd
+import pytest
+
+from app.services.foreign_stock_service import ForeignStockService
+
+COLUMNS = {'open': 'open', 'high': 'high', 'low': 'low', 'close': 'close', 'volume': 'volume'}
+
+
+def make_frame(**drop):
+    df = pd.DataFrame({
+        'open': [10, 10.2], 'high': [10.5, 10.8], 'low': [9.8, 10.0], 'close': [10.2, 10.6],
+        'volume': [100000, 120000],
+    })
+    return df.drop(columns=list(drop))
+
+
+def test_frame_to_kline_converts_columns():
+    items = ForeignStockService._frame_to_kline(['2024-09-01', '2024-09-02'], make_frame(), COLUMNS)
+    assert items[0] == {
+        'date': '2024-09-01', 'trade_date': '2024-09-01',
+        'open': 10.0, 'high': 10.5, 'low': 9.8, 'close': 10.2, 'volume': 100000,
+    }
+    assert isinstance(items[1]['open'], float) and isinstance(items[1]['volume'], int)
+
+
+def test_frame_to_kline_missing_volume_defaults_to_zero():
+    items = ForeignStockService._frame_to_kline(['2024-09-01', '2024-09-02'], make_frame(volume=1), COLUMNS)
+    assert [item['volume'] for item in items] == [0, 0]
+
+
+@pytest.mark.parametrize("missing", ['open', 'close'])
+def test_frame_to_kline_missing_price_raises(missing):
+    # 价格列缺失必须抛错，调用方据此切换数据源，而不是返回价格为 0 的K线
+    with pytest.raises(KeyError):
+        ForeignStockService._frame_to_kline(['2024-09-01', '2024-09-02'], make_frame(**{missing: 1}), COLUMNS)
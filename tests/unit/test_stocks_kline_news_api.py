@@ -5,7 +5,7 @@ from unittest.mock import patch
 
 # Build a minimal app that mounts only the stocks router to avoid triggering app.main lifespan
 from app.routers import stocks as stocks_router
-from app.routers.auth import get_current_user
+from app.routers.auth_db import get_current_user
 
 
 def create_test_app():
@@ -21,8 +21,9 @@ def create_test_app():
     return app
 
 
-@pytest.fixture()
+@pytest.fixture(scope="module")
 def client():
+    # 各用例只在自身作用域内 patch 数据源，应用与 TestClient 可在本模块内共享，只启动一次
     app = create_test_app()
     with TestClient(app) as c:
         yield c
@@ -48,6 +49,56 @@ def test_kline_ok_source_and_adj(client):
         assert isinstance(data["items"], list) and len(data["items"]) == 2
 
 
+def test_kline_items_from_frame_columns():
+    import pandas as pd
+    df = pd.DataFrame({
+        "trade_date": ["2024-09-01", "2024-09-02"],
+        "open": [10, 10.2], "high": [10.5, 10.8], "low": [9.8, 10.0], "close": [10.2, 10.6],
+        "vol": [100000, 120000],
+    })
+    items = stocks_router._kline_items_from_frame(df)
+    assert items[0] == {
+        "time": "2024-09-01", "open": 10.0, "high": 10.5, "low": 9.8, "close": 10.2,
+        "volume": 100000.0, "amount": None,
+    }
+    assert isinstance(items[1]["open"], float)
+
+
+def test_kline_columnar_layout():
+    items = [
+        {"time": "2024-09-01", "open": 10.0, "close": 10.2},
+        {"time": "2024-09-02", "open": 10.2, "close": 10.6},
+    ]
+    out = stocks_router._kline_columnar(items)
+    assert out["columns"] == ["time", "open", "close"]
+    assert out["data"]["close"] == [10.2, 10.6]
+    assert stocks_router._kline_columnar([]) == {"columns": [], "data": {}}
+
+
+def test_kline_columnar_layout_via_request(client):
+    from unittest.mock import MagicMock
+    items = [
+        {"time": "2024-09-06", "open": 10.0, "high": 10.5, "low": 9.8, "close": 10.2, "volume": 1e5, "amount": 2.3e6},
+        {"time": "2024-09-13", "open": 10.2, "high": 10.8, "low": 10.0, "close": 10.6, "volume": 1.2e5, "amount": 2.8e6},
+    ]
+    adapter = MagicMock()
+    adapter.get_historical_data.return_value = None
+    with patch("tradingagents.dataflows.cache.mongodb_cache_adapter.get_mongodb_cache_adapter", return_value=adapter), \
+            patch("app.services.data_sources.manager.DataSourceManager.get_kline_with_fallback", return_value=(items, "tushare")):
+        resp = client.get("/api/stocks/000001/kline", params={"period": "week", "limit": 2, "layout": "columnar"})
+    assert resp.status_code == 200
+    data = resp.json()["data"]
+    assert data["source"] == "tushare"
+    assert data["items"]["columns"] == ["time", "open", "high", "low", "close", "volume", "amount"]
+    assert data["items"]["data"]["time"] == ["2024-09-06", "2024-09-13"]
+    assert data["items"]["data"]["close"] == [10.2, 10.6]
+
+
+def test_kline_invalid_layout_returns_422(client):
+    resp = client.get("/api/stocks/000001/kline", params={"layout": "rows"})
+    assert resp.status_code == 422
+
+
 def test_kline_invalid_period_returns_400(client):
     resp = client.get("/api/stocks/000001/kline", params={"period": "2m", "limit": 10})
     assert resp.status_code == 400
@@ -74,3 +125,42 @@ def test_news_ok_with_announcements_and_source(client):
         assert data["source"] == "tushare"
         assert isinstance(data["items"], list) and len(data["items"]) == 2
 
+
+def test_kline_payload_empty_history_keeps_shape():
+    data = stocks_router._kline_payload("000001", "day", 10, "", None, None, "records")
+    assert data == {"code": "000001", "period": "day", "limit": 10, "adj": "none", "source": None, "items": []}
+    columnar = stocks_router._kline_payload("000001", "day", 10, "qfq", "mongodb", [], "columnar")
+    assert columnar["items"] == {"columns": [], "data": {}}
+    assert columnar["adj"] == "qfq"
+
+
+def test_kline_foreign_reports_unadjusted(client):
+    from unittest.mock import AsyncMock, MagicMock
+    items = [{"time": "2024-09-02", "open": 1.0, "high": 1.2, "low": 0.9, "close": 1.1, "volume": 10.0}]
+    service_cls = MagicMock()
+    service_cls.return_value.get_kline = AsyncMock(return_value=items)
+    with patch("app.services.foreign_stock_service.ForeignStockService", service_cls), \
+            patch.object(stocks_router, "get_mongo_db", return_value=None):
+        resp = client.get("/api/stocks/AAPL/kline", params={"period": "day", "limit": 1, "adj": "qfq"})
+    assert resp.status_code == 200
+    data = resp.json()["data"]
+    # 港美股数据不做复权，不能回显调用方的 adj
+    assert data["adj"] == "none"
+    assert data["items"] == items
+
+
+def test_kline_empty_history_short_circuits(client):
+    from unittest.mock import MagicMock
+    adapter = MagicMock()
+    adapter.get_historical_data.return_value = None
+    mongo = MagicMock()
+    with patch("tradingagents.dataflows.cache.mongodb_cache_adapter.get_mongodb_cache_adapter", return_value=adapter), \
+            patch("app.services.data_sources.manager.DataSourceManager.get_kline_with_fallback", return_value=([], None)), \
+            patch.object(stocks_router, "get_mongo_db", mongo):
+        resp = client.get("/api/stocks/999999/kline", params={"period": "day", "limit": 5, "adj": "qfq"})
+    assert resp.status_code == 200
+    assert resp.json()["data"] == {
+        "code": "999999", "period": "day", "limit": 5, "adj": "qfq", "source": None, "items": [],
+    }
+    # 无历史数据时不再查询 market_quotes
+    mongo.assert_not_called()
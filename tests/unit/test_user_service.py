@@ -0,0 +1,117 @@
+import asyncio
+import hashlib
+
+import pytest
+from bson import ObjectId
+
+import app.services.user_service as us_mod
+from app.services.user_service import UserService
+
+
+class _FakeUsers:
+    """只实现 authenticate_user 用到的 find_one / update_one"""
+
+    def __init__(self, doc):
+        self.doc = doc
+        self.updates = []
+
+    def find_one(self, query):
+        if self.doc and query.get("username") == self.doc["username"]:
+            return dict(self.doc)
+        return None
+
+    def update_one(self, query, update):
+        self.updates.append((query, update))
+
+
+def make_service(doc):
+    # 不连接 MongoDB，直接注入假集合
+    service = UserService.__new__(UserService)
+    service.client = None
+    service.users_collection = _FakeUsers(doc)
+    service._user_cache = {}
+    return service
+
+
+def make_doc(hashed_password):
+    return {
+        "_id": ObjectId(),
+        "username": "alice",
+        "email": "alice@example.com",
+        "hashed_password": hashed_password,
+        "is_active": True,
+    }
+
+
+def test_hash_and_verify_round_trip():
+    hashed = UserService.hash_password("s3cret!")
+    assert hashed.startswith("$2")
+    assert not UserService.is_legacy_hash(hashed)
+    assert UserService.verify_password("s3cret!", hashed)
+
+
+def test_wrong_password_rejected():
+    hashed = UserService.hash_password("s3cret!")
+    assert not UserService.verify_password("S3cret!", hashed)
+    assert not UserService.verify_password("s3cret!", "")
+
+
+def test_legacy_sha256_hash_uses_compare_digest(monkeypatch):
+    legacy = hashlib.sha256("admin123".encode()).hexdigest()
+    calls = []
+    real_compare = us_mod.hmac.compare_digest
+
+    def spy(a, b):
+        calls.append((a, b))
+        return real_compare(a, b)
+
+    monkeypatch.setattr(us_mod.hmac, "compare_digest", spy)
+    assert UserService.is_legacy_hash(legacy)
+    assert UserService.verify_password("admin123", legacy)
+    assert not UserService.verify_password("admin1234", legacy)
+    assert calls == [
+        (legacy, legacy),
+        (hashlib.sha256("admin1234".encode()).hexdigest(), legacy),
+    ]
+
+
+def test_malformed_bcrypt_hash_returns_false():
+    assert UserService.verify_password("s3cret!", "$2b$12$not-a-valid-bcrypt-hash") is False
+
+
+def test_password_over_72_bytes_still_verifies():
+    password = "密码" * 20 + "x" * 30  # 150 字节
+    assert len(password.encode()) > 72
+    hashed = UserService.hash_password(password)
+    assert UserService.verify_password(password, hashed)
+
+
+def test_authenticate_upgrades_legacy_hash():
+    service = make_service(make_doc(hashlib.sha256("admin123".encode()).hexdigest()))
+    user = asyncio.run(service.authenticate_user("alice", "admin123"))
+    assert user is not None
+    assert user.hashed_password.startswith("$2")
+
+    (query, update), = service.users_collection.updates
+    new_hash = update["$set"]["hashed_password"]
+    assert new_hash.startswith("$2")
+    assert UserService.verify_password("admin123", new_hash)
+    assert "last_login" in update["$set"]
+
+
+def test_authenticate_keeps_bcrypt_hash():
+    hashed = UserService.hash_password("s3cret!")
+    service = make_service(make_doc(hashed))
+    user = asyncio.run(service.authenticate_user("alice", "s3cret!"))
+    assert user is not None
+    assert user.hashed_password == hashed
+
+    (query, update), = service.users_collection.updates
+    assert "hashed_password" not in update["$set"]
+
+
+@pytest.mark.parametrize("password", ["wrong", ""])
+def test_authenticate_wrong_password_does_not_update(password):
+    service = make_service(make_doc(hashlib.sha256("admin123".encode()).hexdigest()))
+    assert asyncio.run(service.authenticate_user("alice", password)) is None
+    assert service.users_collection.updates == []
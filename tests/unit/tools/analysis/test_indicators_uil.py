@@ -48,3 +48,112 @@ def test_no_inplace_modification():
     out = compute_many(df, [IndicatorSpec('ma', {'n': 5})])
     assert 'ma5' in out.columns and 'ma5' not in df.columns
 
+
+
+def test_compute_many_matches_single_indicator():
+    from tradingagents.tools.analysis.indicators import compute_indicator
+    df = make_df(120)
+    specs = [
+        IndicatorSpec('ema', {'n': 12}),
+        IndicatorSpec('macd'),
+        IndicatorSpec('ma', {'n': 20}),
+        IndicatorSpec('boll', {'n': 20, 'k': 2}),
+    ]
+    fused = compute_many(df, specs)
+    for s in specs:
+        single = compute_indicator(df, s)
+        for col in single.columns.difference(df.columns):
+            pd.testing.assert_series_equal(fused[col], single[col])
+
+
+def test_compute_many_float32_dtype():
+    df = make_df(60)
+    out = compute_many(df, [IndicatorSpec('ma', {'n': 5}), IndicatorSpec('kdj')], dtype=np.float32)
+    for col in ['ma5', 'kdj_k', 'kdj_d', 'kdj_j']:
+        assert out[col].dtype == np.float32
+    # 原始列保持不变
+    assert out['close'].dtype == df['close'].dtype
+
+
+def test_macd_reuses_precomputed_ema():
+    from tradingagents.tools.analysis.indicators import ema, macd
+    df = make_df(120)
+    close = df['close']
+    shared = macd(close, ema_fast=ema(close, 12), ema_slow=ema(close, 26))
+    pd.testing.assert_frame_equal(shared, macd(close))
+
+
+def test_add_all_indicators_matches_single_functions():
+    from tradingagents.tools.analysis.indicators import add_all_indicators, ma, rsi
+    df = make_df(120)
+    out = add_all_indicators(df.copy(), rsi_style='china')
+    np.testing.assert_allclose(out['ma20'], ma(df['close'], 20))
+    np.testing.assert_allclose(out['rsi6'], rsi(df['close'], 6, method='china'))
+    np.testing.assert_allclose(out['rsi14'], rsi(df['close'], 14, method='sma'))
+    assert list(out.columns[:len(df.columns)]) == list(df.columns)
+
+
+def test_moving_averages_match_rolling_with_nan():
+    from tradingagents.tools.analysis.indicators import _moving_averages
+    close = make_df(100)['close']
+    close.iloc[[3, 40, 41]] = np.nan
+    result = _moving_averages(close, (5, 20), min_periods=3)
+    for n in (5, 20):
+        expected = close.rolling(window=n, min_periods=3).mean()
+        np.testing.assert_allclose(result[n], expected, rtol=1e-10)
+
+
+def test_rsi_matches_where_based_reference():
+    from tradingagents.tools.analysis.indicators import rsi
+    close = make_df(120)['close']
+    delta = close.diff()
+    gain = delta.where(delta > 0, 0)
+    loss = -delta.where(delta < 0, 0)
+    avg_gain = gain.ewm(alpha=1 / 14, adjust=False).mean()
+    avg_loss = loss.ewm(alpha=1 / 14, adjust=False).mean()
+    expected = 100 - 100 / (1 + avg_gain / avg_loss.replace(0, np.nan))
+    out = rsi(close, 14)
+    np.testing.assert_allclose(out, expected, rtol=1e-10)
+    assert out.dropna().between(0, 100).all()
+
+
+def test_last_values_handles_missing_and_nan():
+    from tradingagents.tools.analysis.indicators import last_values
+    df = make_df(10)
+    df['x'] = np.nan
+    out = last_values(df, ['close', 'x', 'missing'])
+    assert out['close'] == df['close'].iloc[-1]
+    assert out['x'] is None and out['missing'] is None
+
+
+def test_compute_many_batch_matches_per_symbol():
+    from tradingagents.tools.analysis.indicators import compute_many_batch
+    frames = {'a': make_df(80, seed=1), 'b': make_df(80, seed=2), 'c': make_df(50, seed=3)}
+    specs = [
+        IndicatorSpec('ma', {'n': 5}),
+        IndicatorSpec('macd'),
+        IndicatorSpec('rsi', {'n': 14}),
+        IndicatorSpec('boll', {'n': 20, 'k': 2}),
+        IndicatorSpec('kdj'),
+    ]
+    batch = compute_many_batch(frames, specs)
+    for code, df in frames.items():
+        single = compute_many(df, specs)
+        assert list(batch[code].columns) == list(single.columns)
+        np.testing.assert_allclose(batch[code].to_numpy(dtype=float), single.to_numpy(dtype=float),
+                                   rtol=1e-9, atol=1e-9)
+
+
+def test_compute_many_assembles_columns_once():
+    import warnings
+    df = make_df(60)
+    df['ma5'] = 0.0
+    specs = [IndicatorSpec('ma', {'n': n}) for n in range(2, 130)]
+    with warnings.catch_warnings():
+        warnings.simplefilter('error', pd.errors.PerformanceWarning)
+        out = compute_many(df, specs)
+    # 已有同名列原位覆盖，新列按指标顺序追加
+    assert list(out.columns[:len(df.columns)]) == list(df.columns)
+    assert math.isclose(out['ma5'].iloc[-1], df['close'].iloc[-5:].mean())
+    assert list(out.columns[len(df.columns):]) == [f"ma{n}" for n in range(2, 130) if n != 5]
+    assert (df['ma5'] == 0.0).all()
@@ -0,0 +1,93 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from tradingagents.tools.analysis import _kernels
+
+
+@pytest.mark.parametrize("kind", ["mean", "std", "min", "max"])
+@pytest.mark.parametrize("window,min_periods", [(1, 1), (5, 1), (5, 5), (20, 20)])
+def test_rolling_kernels_match_pandas(kind, window, min_periods):
+    rng = np.random.default_rng(7)
+    x = rng.normal(100, 5, 300)
+    x[[3, 50, 51, 52]] = np.nan
+    x[120:140] = np.nan
+
+    got = getattr(_kernels, f"rolling_{kind}")(x, window, min_periods)
+    expected = getattr(pd.Series(x).rolling(window, min_periods=min_periods), kind)().to_numpy()
+    assert np.allclose(got, expected, equal_nan=True, atol=1e-8)
+
+
+@pytest.mark.parametrize("alpha,adjust", [(2 / 13, False), (1 / 14, False), (1 / 6, True), (0.5, True)])
+def test_ewm_mean_matches_pandas(alpha, adjust):
+    rng = np.random.default_rng(7)
+    x = np.cumsum(rng.normal(0, 1, 80)) + 100
+    x[[0, 5, 6, 30]] = np.nan
+
+    got = _kernels.ewm_mean(x, alpha, adjust)
+    expected = pd.Series(x).ewm(alpha=alpha, adjust=adjust).mean().to_numpy()
+    np.testing.assert_allclose(got, expected, rtol=1e-12)
+
+
+def _kdj_reference(rsv, m1, m2):
+    """原 kdj() 中逐行 iloc 递推的实现"""
+    rsv = pd.Series(rsv)
+    k = pd.Series(np.nan, index=rsv.index)
+    d = pd.Series(np.nan, index=rsv.index)
+    alpha_k = 1 / float(m1)
+    alpha_d = 1 / float(m2)
+    last_k = 50.0
+    last_d = 50.0
+    for i in range(len(rsv)):
+        rv = rsv.iloc[i]
+        if np.isnan(rv):
+            k.iloc[i] = np.nan
+            d.iloc[i] = np.nan
+            continue
+        curr_k = (1 - alpha_k) * last_k + alpha_k * rv
+        curr_d = (1 - alpha_d) * last_d + alpha_d * curr_k
+        k.iloc[i] = curr_k
+        d.iloc[i] = curr_d
+        last_k, last_d = curr_k, curr_d
+    return k.to_numpy(), d.to_numpy()
+
+
+@pytest.mark.parametrize("m1,m2", [(3, 3), (5, 2)])
+def test_kdj_recurrence_matches_iloc_loop(m1, m2):
+    rng = np.random.default_rng(3)
+    rsv = rng.uniform(0, 100, 120)
+    # 起始窗口不足与中间缺失：输出 NaN 且不推进 K/D 状态
+    rsv[:8] = np.nan
+    rsv[[40, 41, 77]] = np.nan
+
+    k, d = _kernels.kdj_recurrence(rsv, 1 / float(m1), 1 / float(m2))
+    exp_k, exp_d = _kdj_reference(rsv, m1, m2)
+    np.testing.assert_allclose(k, exp_k, rtol=1e-12)
+    np.testing.assert_allclose(d, exp_d, rtol=1e-12)
+    assert np.isnan(k[[0, 7, 40, 41, 77]]).all() and np.isnan(d[[0, 7, 40, 41, 77]]).all()
+    # 缺失行之后从缺失前的状态继续递推
+    assert k[42] == pytest.approx((1 - 1 / m1) * k[39] + rsv[42] / m1)
+
+
+def test_fused_close_indicators_match_pandas():
+    rng = np.random.default_rng(11)
+    x = np.cumsum(rng.normal(0, 1, 200)) + 100
+    x[[0, 30, 31, 90]] = np.nan
+    s = pd.Series(x)
+
+    ma, dif, dea, boll_std, rsi = _kernels.fused_close_indicators(
+        x, np.array([5, 20, 60], dtype=np.int64), 12, 26, 9, 20, 14
+    )
+
+    for row, w in zip(ma, (5, 20, 60)):
+        assert np.allclose(row, s.rolling(w, min_periods=1).mean(), equal_nan=True, atol=1e-8)
+    exp_dif = s.ewm(alpha=2 / 13, adjust=False).mean() - s.ewm(alpha=2 / 27, adjust=False).mean()
+    assert np.allclose(dif, exp_dif, equal_nan=True, atol=1e-8)
+    assert np.allclose(dea, exp_dif.ewm(alpha=0.2, adjust=False).mean(), equal_nan=True, atol=1e-8)
+    assert np.allclose(boll_std, s.rolling(20, min_periods=1).std(), equal_nan=True, atol=1e-8)
+
+    delta = s.diff()
+    avg_gain = delta.where(delta > 0, 0.0).ewm(alpha=1 / 14, adjust=False).mean()
+    avg_loss = (-delta.where(delta < 0, 0.0)).ewm(alpha=1 / 14, adjust=False).mean()
+    exp_rsi = 100 - 100 / (1 + avg_gain / avg_loss.mask(avg_loss == 0))
+    assert np.allclose(rsi, exp_rsi, equal_nan=True, atol=1e-8)
@@ -1202,9 +1202,9 @@ class Toolkit:
                     logger.info(f"🇨🇳🇭🇰 [统一新闻工具] 尝试获取东方财富新闻: {clean_ticker}")
 
                     # 通过 AKShare Provider 获取新闻
-                    from tradingagents.dataflows.providers.china.akshare import AKShareProvider
+                    from tradingagents.dataflows.providers.china.akshare import get_akshare_provider
 
-                    provider = AKShareProvider()
+                    provider = get_akshare_provider()
 
                     # 获取东方财富新闻
                     news_df = provider.get_stock_news_sync(symbol=clean_ticker)
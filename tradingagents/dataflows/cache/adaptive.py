@@ -4,18 +4,145 @@
 根据数据库可用性自动选择最佳缓存策略
 """
 
+import io
 import os
 import json
 import pickle
 import hashlib
 import logging
+import threading
+import time
+from collections import OrderedDict
+from functools import lru_cache
 from datetime import datetime, timedelta
 from pathlib import Path
-from typing import Any, Dict, Optional, Union
+from zoneinfo import ZoneInfo
+from typing import Any, Dict, List, Optional, Union
 import pandas as pd
 
 from tradingagents.config.database_manager import get_database_manager
 
+# Parquet（可选）：DataFrame 以列式压缩字节存入 Redis/MongoDB，体积远小于 JSON/pickle
+try:
+    import pyarrow  # noqa: F401
+    PARQUET_AVAILABLE = True
+except ImportError:
+    PARQUET_AVAILABLE = False
+
+# Redis 中原本使用 pickle（解码最快），只有行数较多时 Parquet 的体积优势才明显
+REDIS_PARQUET_MIN_ROWS = 1000
+
+
+def _dataframe_to_parquet(df: pd.DataFrame) -> Optional[bytes]:
+    """DataFrame -> Parquet 字节（snappy 压缩），不支持时返回 None"""
+    if not PARQUET_AVAILABLE:
+        return None
+    try:
+        buf = io.BytesIO()
+        df.to_parquet(buf, engine='pyarrow', compression='snappy')
+        return buf.getvalue()
+    except Exception:
+        # 例如非字符串列名、混合类型列等 Parquet 无法表示的情况
+        return None
+
+
+def _parquet_to_dataframe(raw: bytes) -> pd.DataFrame:
+    """Parquet 字节 -> DataFrame"""
+    return pd.read_parquet(io.BytesIO(raw), engine='pyarrow')
+
+
+# 进程内 L0 缓存：热点键直接命中内存，免去 Redis/MongoDB 往返与反序列化
+MEMORY_CACHE_MAXSIZE = 256
+MEMORY_CACHE_TTL = 60  # 秒，L0 只做短期热点缓存，过期后回源到主要后端
+
+
+# 缓存键只由参数决定，热点股票的键会被反复计算，记忆化后重复请求只需一次字典查找
+CACHE_KEY_LRU_SIZE = 65536
+
+
+@lru_cache(maxsize=CACHE_KEY_LRU_SIZE)
+def _build_cache_key(symbol: str, start_date: str, end_date: str, data_source: str, data_type: str) -> str:
+    """生成缓存键（md5）"""
+    key_data = f"{symbol}_{start_date}_{end_date}_{data_source}_{data_type}"
+    # 仅用于生成键，不涉及安全；声明 usedforsecurity=False 以免在启用 FIPS 的系统上被拒绝
+    return hashlib.md5(key_data.encode(), usedforsecurity=False).hexdigest()
+
+
+# 各市场开盘时间（交易所当地时区），用于计算历史行情缓存的有效期
+MARKET_OPEN_TIMES = {
+    "china": ("Asia/Shanghai", 9, 30),
+    "us": ("America/New_York", 9, 30),
+}
+
+
+def _seconds_until_next_market_open(market: str, now: Optional[datetime] = None) -> int:
+    """距离下一个交易日开盘的秒数（仅跳过周末，不考虑节假日）"""
+    tz_name, hour, minute = MARKET_OPEN_TIMES.get(market, MARKET_OPEN_TIMES["us"])
+    tz = ZoneInfo(tz_name)
+    now = now.astimezone(tz) if now is not None else datetime.now(tz)
+
+    next_open = now.replace(hour=hour, minute=minute, second=0, microsecond=0)
+    if next_open <= now:
+        next_open += timedelta(days=1)
+    while next_open.weekday() >= 5:
+        next_open += timedelta(days=1)
+    return int((next_open - now).total_seconds())
+
+
+def _parse_date(value: str) -> Optional[datetime]:
+    """解析 YYYY-MM-DD / YYYYMMDD 格式日期"""
+    for fmt in ("%Y-%m-%d", "%Y%m%d"):
+        try:
+            return datetime.strptime(value, fmt)
+        except (TypeError, ValueError):
+            continue
+    return None
+
+
+class _MemoryLRU:
+    """带过期时间的简单 LRU（线程安全）"""
+
+    def __init__(self, maxsize: int, ttl_seconds: int):
+        self.maxsize = maxsize
+        self.ttl_seconds = ttl_seconds
+        self._store: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: str) -> Optional[Any]:
+        with self._lock:
+            entry = self._store.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            expires_at, value = entry
+            if expires_at <= time.monotonic():
+                del self._store[key]
+                self.misses += 1
+                return None
+            self._store.move_to_end(key)
+            self.hits += 1
+        # DataFrame 返回副本，避免调用方修改污染缓存
+        return value.copy() if isinstance(value, pd.DataFrame) else value
+
+    def set(self, key: str, value: Any, ttl_seconds: Optional[float] = None):
+        ttl = self.ttl_seconds if ttl_seconds is None else min(ttl_seconds, self.ttl_seconds)
+        if ttl <= 0:
+            return
+        if isinstance(value, pd.DataFrame):
+            value = value.copy()
+        with self._lock:
+            self._store[key] = (time.monotonic() + ttl, value)
+            self._store.move_to_end(key)
+            while len(self._store) > self.maxsize:
+                self._store.popitem(last=False)
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {'size': len(self._store), 'hits': self.hits, 'misses': self.misses}
+
+
 class AdaptiveCacheSystem:
     """自适应缓存系统"""
     
@@ -39,17 +166,27 @@ class AdaptiveCacheSystem:
         # 初始化缓存后端
         self.primary_backend = self.cache_config["primary_backend"]
         self.fallback_enabled = self.cache_config["fallback_enabled"]
+
+        # L0 进程内缓存
+        self.memory_cache = _MemoryLRU(MEMORY_CACHE_MAXSIZE, MEMORY_CACHE_TTL)
+
+        # MongoDB 缓存集合的 TTL 索引（首次使用时创建）
+        self._mongodb_ttl_index_ready = False
         
         self.logger.info(f"自适应缓存系统初始化 - 主要后端: {self.primary_backend}")
     
     def _get_cache_key(self, symbol: str, start_date: str = "", end_date: str = "", 
                       data_source: str = "default", data_type: str = "stock_data") -> str:
         """生成缓存键"""
-        key_data = f"{symbol}_{start_date}_{end_date}_{data_source}_{data_type}"
-        return hashlib.md5(key_data.encode()).hexdigest()
+        return _build_cache_key(symbol, start_date, end_date, data_source, data_type)
     
-    def _get_ttl_seconds(self, symbol: str, data_type: str = "stock_data") -> int:
-        """获取TTL秒数"""
+    def _get_ttl_seconds(self, symbol: str, data_type: str = "stock_data", end_date: str = "") -> int:
+        """
+        获取TTL秒数
+
+        行情数据的结束日期早于今天时（已收盘的历史数据），内容在下一个交易日开盘前不会变化，
+        TTL 延长到下一次开盘；否则使用 ttl_settings 中按市场/数据类型配置的固定 TTL。
+        """
         # 判断市场类型
         if len(symbol) == 6 and symbol.isdigit():
             market = "china"
@@ -59,7 +196,21 @@ class AdaptiveCacheSystem:
         # 获取TTL配置
         ttl_key = f"{market}_{data_type}"
         ttl_seconds = self.cache_config["ttl_settings"].get(ttl_key, 7200)
+
+        if data_type == "stock_data" and end_date:
+            end = _parse_date(end_date)
+            tz_name = MARKET_OPEN_TIMES.get(market, MARKET_OPEN_TIMES["us"])[0]
+            if end is not None and end.date() < datetime.now(ZoneInfo(tz_name)).date():
+                ttl_seconds = max(ttl_seconds, _seconds_until_next_market_open(market))
+
         return ttl_seconds
+
+    def _get_metadata_ttl(self, metadata: Dict) -> int:
+        """从缓存元数据获取TTL：优先使用保存时记录的值"""
+        ttl_seconds = metadata.get('ttl_seconds')
+        if ttl_seconds is not None:
+            return int(ttl_seconds)
+        return self._get_ttl_seconds(metadata.get('symbol', ''), metadata.get('data_type', 'stock_data'))
     
     def _is_cache_valid(self, cache_time: datetime, ttl_seconds: int) -> bool:
         """检查缓存是否有效"""
@@ -94,12 +245,12 @@ class AdaptiveCacheSystem:
         """从文件缓存加载"""
         try:
             cache_file = self.cache_dir / f"{cache_key}.pkl"
-            if not cache_file.exists():
+            try:
+                with open(cache_file, 'rb') as f:
+                    cache_data = pickle.load(f)
+            except FileNotFoundError:
                 return None
             
-            with open(cache_file, 'rb') as f:
-                cache_data = pickle.load(f)
-            
             self.logger.debug(f"文件缓存加载成功: {cache_key}")
             return cache_data
             
@@ -114,14 +265,7 @@ class AdaptiveCacheSystem:
             return False
         
         try:
-            cache_data = {
-                'data': data,
-                'metadata': metadata,
-                'timestamp': datetime.now().isoformat(),
-                'backend': 'redis'
-            }
-            
-            serialized_data = pickle.dumps(cache_data)
+            serialized_data = self._encode_redis_payload(data, metadata)
             redis_client.setex(cache_key, ttl_seconds, serialized_data)
             
             self.logger.debug(f"Redis缓存保存成功: {cache_key}")
@@ -142,11 +286,7 @@ class AdaptiveCacheSystem:
             if not serialized_data:
                 return None
             
-            cache_data = pickle.loads(serialized_data)
-            
-            # 转换时间戳
-            if isinstance(cache_data['timestamp'], str):
-                cache_data['timestamp'] = datetime.fromisoformat(cache_data['timestamp'])
+            cache_data = self._decode_redis_payload(serialized_data)
             
             self.logger.debug(f"Redis缓存加载成功: {cache_key}")
             return cache_data
@@ -155,6 +295,94 @@ class AdaptiveCacheSystem:
             self.logger.error(f"Redis缓存加载失败: {e}")
             return None
     
+    @staticmethod
+    def _encode_redis_payload(data: Any, metadata: Dict, timestamp: Optional[str] = None) -> bytes:
+        """序列化Redis缓存条目；批量写入时由调用方传入统一的时间戳"""
+        cache_data = {
+            'data': data,
+            'metadata': metadata,
+            'timestamp': timestamp or datetime.now().isoformat(),
+            'backend': 'redis'
+        }
+
+        # 较大的 DataFrame 以 Parquet 字节存储，减少 Redis 内存占用
+        if isinstance(data, pd.DataFrame) and len(data) >= REDIS_PARQUET_MIN_ROWS:
+            parquet_bytes = _dataframe_to_parquet(data)
+            if parquet_bytes is not None:
+                cache_data['data'] = parquet_bytes
+                cache_data['data_format'] = 'parquet'
+
+        return pickle.dumps(cache_data, protocol=pickle.HIGHEST_PROTOCOL)
+
+    def _save_many_to_redis(self, entries: List[tuple]) -> bool:
+        """批量保存到Redis缓存（非事务 pipeline，一次往返）"""
+        redis_client = self.db_manager.get_redis_client()
+        if not redis_client:
+            return False
+
+        try:
+            timestamp = datetime.now().isoformat()
+            pipe = redis_client.pipeline(transaction=False)
+            for cache_key, data, metadata, ttl_seconds in entries:
+                pipe.setex(cache_key, ttl_seconds, self._encode_redis_payload(data, metadata, timestamp))
+            pipe.execute()
+
+            self.logger.debug(f"Redis缓存批量保存成功: {len(entries)}条")
+            return True
+
+        except Exception as e:
+            self.logger.error(f"Redis缓存批量保存失败: {e}")
+            return False
+
+    @staticmethod
+    def _decode_redis_payload(serialized_data: bytes) -> Dict:
+        """反序列化Redis中的缓存条目"""
+        cache_data = pickle.loads(serialized_data)
+
+        # 转换时间戳
+        if isinstance(cache_data['timestamp'], str):
+            cache_data['timestamp'] = datetime.fromisoformat(cache_data['timestamp'])
+
+        if cache_data.get('data_format') == 'parquet':
+            cache_data['data'] = _parquet_to_dataframe(cache_data['data'])
+        return cache_data
+
+    def _load_many_from_redis(self, cache_keys: List[str]) -> Dict[str, Dict]:
+        """从Redis批量加载（一次 MGET 往返），只返回命中的键"""
+        redis_client = self.db_manager.get_redis_client()
+        if not redis_client or not cache_keys:
+            return {}
+
+        try:
+            values = redis_client.mget(cache_keys)
+        except Exception as e:
+            self.logger.error(f"Redis批量加载失败: {e}")
+            return {}
+
+        results = {}
+        for cache_key, serialized_data in zip(cache_keys, values):
+            if not serialized_data:
+                continue
+            try:
+                results[cache_key] = self._decode_redis_payload(serialized_data)
+            except Exception as e:
+                self.logger.error(f"Redis缓存反序列化失败 {cache_key}: {e}")
+
+        self.logger.debug(f"Redis批量加载: 命中 {len(results)}/{len(cache_keys)}")
+        return results
+
+    def _ensure_mongodb_ttl_index(self, collection) -> None:
+        """在 expires_at 上创建 TTL 索引，由 MongoDB 服务端自动删除过期缓存（幂等）"""
+        if self._mongodb_ttl_index_ready:
+            return
+        try:
+            collection.create_index('expires_at', expireAfterSeconds=0, name='expires_at_ttl')
+            self._mongodb_ttl_index_ready = True
+        except Exception as e:
+            # 索引创建失败不影响缓存读写，读取时仍会检查过期时间
+            self.logger.warning(f"MongoDB缓存TTL索引创建失败: {e}")
+            self._mongodb_ttl_index_ready = True
+
     def _save_to_mongodb(self, cache_key: str, data: Any, metadata: Dict, ttl_seconds: int) -> bool:
         """保存到MongoDB缓存"""
         mongodb_client = self.db_manager.get_mongodb_client()
@@ -164,25 +392,9 @@ class AdaptiveCacheSystem:
         try:
             db = mongodb_client.tradingagents
             collection = db.cache
+            self._ensure_mongodb_ttl_index(collection)
             
-            # 序列化数据
-            if isinstance(data, pd.DataFrame):
-                serialized_data = data.to_json()
-                data_type = 'dataframe'
-            else:
-                serialized_data = pickle.dumps(data).hex()
-                data_type = 'pickle'
-            
-            cache_doc = {
-                '_id': cache_key,
-                'data': serialized_data,
-                'data_type': data_type,
-                'metadata': metadata,
-                'timestamp': datetime.now(),
-                'expires_at': datetime.now() + timedelta(seconds=ttl_seconds),
-                'backend': 'mongodb'
-            }
-            
+            cache_doc = self._build_mongodb_doc(cache_key, data, metadata, ttl_seconds)
             collection.replace_one({'_id': cache_key}, cache_doc, upsert=True)
             
             self.logger.debug(f"MongoDB缓存保存成功: {cache_key}")
@@ -191,6 +403,64 @@ class AdaptiveCacheSystem:
         except Exception as e:
             self.logger.error(f"MongoDB缓存保存失败: {e}")
             return False
+
+    @staticmethod
+    def _build_mongodb_doc(cache_key: str, data: Any, metadata: Dict, ttl_seconds: int,
+                           now: Optional[datetime] = None, utc_now: Optional[datetime] = None) -> Dict:
+        """构造MongoDB缓存文档；批量写入时由调用方传入统一的当前时间"""
+        # 序列化数据（二进制直接存为 BSON Binary，不再转 hex）
+        parquet_bytes = _dataframe_to_parquet(data) if isinstance(data, pd.DataFrame) else None
+        if parquet_bytes is not None:
+            serialized_data = parquet_bytes
+            data_type = 'parquet'
+        elif isinstance(data, pd.DataFrame):
+            serialized_data = data.to_json()
+            data_type = 'dataframe'
+        else:
+            serialized_data = pickle.dumps(data, protocol=pickle.HIGHEST_PROTOCOL)
+            data_type = 'pickle'
+
+        return {
+            '_id': cache_key,
+            'data': serialized_data,
+            'data_type': data_type,
+            'metadata': metadata,
+            'timestamp': now or datetime.now(),
+            # TTL 索引按 UTC 判断过期，必须写入 UTC 时间；expires_at_utc 标记区分旧版按本地时间写入的文档
+            'expires_at': (utc_now or datetime.utcnow()) + timedelta(seconds=ttl_seconds),
+            'expires_at_utc': True,
+            'backend': 'mongodb'
+        }
+
+    def _save_many_to_mongodb(self, entries: List[tuple]) -> bool:
+        """批量保存到MongoDB缓存（一次 bulk_write 往返，ordered=False 时单条失败不影响其余写入）"""
+        mongodb_client = self.db_manager.get_mongodb_client()
+        if not mongodb_client:
+            return False
+
+        try:
+            from pymongo import ReplaceOne
+
+            collection = mongodb_client.tradingagents.cache
+            self._ensure_mongodb_ttl_index(collection)
+
+            now, utc_now = datetime.now(), datetime.utcnow()
+            operations = [
+                ReplaceOne(
+                    {'_id': cache_key},
+                    self._build_mongodb_doc(cache_key, data, metadata, ttl_seconds, now, utc_now),
+                    upsert=True,
+                )
+                for cache_key, data, metadata, ttl_seconds in entries
+            ]
+            collection.bulk_write(operations, ordered=False)
+
+            self.logger.debug(f"MongoDB缓存批量保存成功: {len(entries)}条")
+            return True
+
+        except Exception as e:
+            self.logger.error(f"MongoDB缓存批量保存失败: {e}")
+            return False
     
     def _load_from_mongodb(self, cache_key: str) -> Optional[Dict]:
         """从MongoDB缓存加载"""
@@ -206,16 +476,24 @@ class AdaptiveCacheSystem:
             if not doc:
                 return None
             
-            # 检查是否过期
-            if doc.get('expires_at') and doc['expires_at'] < datetime.now():
-                collection.delete_one({'_id': cache_key})
+            # 旧版文档的 expires_at 为本地时间，按 UTC 比较会在东八区多保留 8 小时，直接视为未命中，
+            # 下次保存时被新文档覆盖
+            if not doc.get('expires_at_utc'):
+                return None
+
+            # 过期文档由 TTL 索引在服务端删除；后台清理约每分钟执行一次，这里只做判断不再额外删除
+            if doc.get('expires_at') and doc['expires_at'] < datetime.utcnow():
                 return None
             
             # 反序列化数据
-            if doc['data_type'] == 'dataframe':
+            if doc['data_type'] == 'parquet':
+                data = _parquet_to_dataframe(doc['data'])
+            elif doc['data_type'] == 'dataframe':
                 data = pd.read_json(doc['data'])
             else:
-                data = pickle.loads(bytes.fromhex(doc['data']))
+                raw = doc['data']
+                # 兼容旧版本写入的 hex 字符串
+                data = pickle.loads(bytes.fromhex(raw) if isinstance(raw, str) else raw)
             
             cache_data = {
                 'data': data,
@@ -234,20 +512,7 @@ class AdaptiveCacheSystem:
     def save_data(self, symbol: str, data: Any, start_date: str = "", end_date: str = "", 
                   data_source: str = "default", data_type: str = "stock_data") -> str:
         """保存数据到缓存"""
-        # 生成缓存键
-        cache_key = self._get_cache_key(symbol, start_date, end_date, data_source, data_type)
-        
-        # 准备元数据
-        metadata = {
-            'symbol': symbol,
-            'start_date': start_date,
-            'end_date': end_date,
-            'data_source': data_source,
-            'data_type': data_type
-        }
-        
-        # 获取TTL
-        ttl_seconds = self._get_ttl_seconds(symbol, data_type)
+        cache_key, metadata, ttl_seconds = self._prepare_entry(symbol, start_date, end_date, data_source, data_type)
         
         # 根据主要后端保存
         success = False
@@ -265,14 +530,81 @@ class AdaptiveCacheSystem:
             success = self._save_to_file(cache_key, data, metadata)
         
         if success:
+            self.memory_cache.set(cache_key, data, ttl_seconds)
             self.logger.info(f"数据缓存成功: {symbol} -> {cache_key} (后端: {self.primary_backend})")
         else:
             self.logger.error(f"数据缓存失败: {symbol}")
         
         return cache_key
     
+    def _prepare_entry(self, symbol: str, start_date: str, end_date: str,
+                       data_source: str, data_type: str) -> tuple:
+        """生成缓存键、元数据和TTL"""
+        cache_key = self._get_cache_key(symbol, start_date, end_date, data_source, data_type)
+        
+        # 准备元数据
+        metadata = {
+            'symbol': symbol,
+            'start_date': start_date,
+            'end_date': end_date,
+            'data_source': data_source,
+            'data_type': data_type
+        }
+        
+        # 获取TTL（记录到元数据，文件缓存据此判断过期）
+        ttl_seconds = self._get_ttl_seconds(symbol, data_type, end_date)
+        metadata['ttl_seconds'] = ttl_seconds
+        return cache_key, metadata, ttl_seconds
+
+    def save_data_many(self, items: Dict[str, Any], start_date: str = "", end_date: str = "",
+                       data_source: str = "default", data_type: str = "stock_data") -> Dict[str, str]:
+        """
+        批量保存同一时间区间的多只股票数据
+
+        Redis 用一次 pipeline、MongoDB 用一次 bulk_write 写入全部条目，代替逐条 save_data 的 N 次往返。
+
+        Args:
+            items: {symbol: data}
+
+        Returns:
+            {symbol: cache_key}
+        """
+        entries = []
+        cache_keys = {}
+        for symbol, data in items.items():
+            cache_key, metadata, ttl_seconds = self._prepare_entry(symbol, start_date, end_date, data_source, data_type)
+            entries.append((cache_key, data, metadata, ttl_seconds))
+            cache_keys[symbol] = cache_key
+        if not entries:
+            return cache_keys
+
+        success = False
+        if self.primary_backend == "redis":
+            success = self._save_many_to_redis(entries)
+        elif self.primary_backend == "mongodb":
+            success = self._save_many_to_mongodb(entries)
+        elif self.primary_backend == "file":
+            success = all([self._save_to_file(cache_key, data, metadata) for cache_key, data, metadata, _ in entries])
+
+        if not success and self.fallback_enabled and self.primary_backend != "file":
+            self.logger.warning(f"主要后端({self.primary_backend})批量保存失败，使用文件缓存降级")
+            success = all([self._save_to_file(cache_key, data, metadata) for cache_key, data, metadata, _ in entries])
+
+        if success:
+            for cache_key, data, _, ttl_seconds in entries:
+                self.memory_cache.set(cache_key, data, ttl_seconds)
+            self.logger.info(f"数据批量缓存成功: {len(entries)}条 (后端: {self.primary_backend})")
+        else:
+            self.logger.error(f"数据批量缓存失败: {len(entries)}条")
+
+        return cache_keys
+
     def load_data(self, cache_key: str) -> Optional[Any]:
         """从缓存加载数据"""
+        data = self.memory_cache.get(cache_key)
+        if data is not None:
+            return data
+
         cache_data = None
         
         # 根据主要后端加载
@@ -288,20 +620,73 @@ class AdaptiveCacheSystem:
             self.logger.debug(f"主要后端({self.primary_backend})加载失败，尝试文件缓存")
             cache_data = self._load_from_file(cache_key)
         
+        return self._unwrap_cache_data(cache_key, cache_data)
+
+    def _unwrap_cache_data(self, cache_key: str, cache_data: Optional[Dict]) -> Optional[Any]:
+        """校验缓存有效性并取出数据"""
         if not cache_data:
             return None
         
         # 检查缓存是否有效（仅对文件缓存，数据库缓存有自己的TTL机制）
+        metadata = cache_data.get('metadata') or {}
+        ttl_seconds = self._get_metadata_ttl(metadata)
+        remaining = self._remaining_seconds(cache_data.get('timestamp'), ttl_seconds)
         if cache_data.get('backend') == 'file':
-            symbol = cache_data['metadata'].get('symbol', '')
-            data_type = cache_data['metadata'].get('data_type', 'stock_data')
-            ttl_seconds = self._get_ttl_seconds(symbol, data_type)
-            
-            if not self._is_cache_valid(cache_data['timestamp'], ttl_seconds):
+            if remaining is None or remaining <= 0:
                 self.logger.debug(f"文件缓存已过期: {cache_key}")
                 return None
-        
-        return cache_data['data']
+
+        # L0 只保留条目的剩余有效期（上限 MEMORY_CACHE_TTL），避免后端过期后内存中仍返回旧数据；
+        # 写入时间未知时不放入 L0
+        data = cache_data['data']
+        if data is not None and remaining is not None:
+            self.memory_cache.set(cache_key, data, remaining)
+        return data
+
+    @staticmethod
+    def _remaining_seconds(cache_time: Any, ttl_seconds: int) -> Optional[float]:
+        """缓存条目的剩余有效期（秒），按写入时间 + TTL 计算；写入时间未知时返回 None"""
+        if not isinstance(cache_time, datetime):
+            return None
+        return (cache_time + timedelta(seconds=ttl_seconds) - datetime.now()).total_seconds()
+
+    def load_data_many(self, cache_keys: List[str]) -> Dict[str, Any]:
+        """
+        批量从缓存加载数据
+
+        Redis 为主要后端时用一次 MGET 取回所有键，未命中的键再逐个走 load_data 的降级流程。
+
+        Returns:
+            {cache_key: data}，只包含命中的键
+        """
+        results: Dict[str, Any] = {}
+        misses = []
+        for cache_key in cache_keys:
+            data = self.memory_cache.get(cache_key)
+            if data is not None:
+                results[cache_key] = data
+            else:
+                misses.append(cache_key)
+
+        if self.primary_backend == "redis":
+            hits = self._load_many_from_redis(misses)
+            for cache_key, cache_data in hits.items():
+                data = self._unwrap_cache_data(cache_key, cache_data)
+                if data is not None:
+                    results[cache_key] = data
+            misses = [k for k in misses if k not in results]
+
+        for cache_key in misses:
+            if self.primary_backend == "redis":
+                # Redis 已确认未命中，只需尝试文件降级
+                cache_data = self._load_from_file(cache_key) if self.fallback_enabled else None
+                data = self._unwrap_cache_data(cache_key, cache_data)
+            else:
+                data = self.load_data(cache_key)
+            if data is not None:
+                results[cache_key] = data
+
+        return results
     
     def find_cached_data(self, symbol: str, start_date: str = "", end_date: str = "", 
                         data_source: str = "default", data_type: str = "stock_data") -> Optional[str]:
@@ -336,6 +721,7 @@ class AdaptiveCacheSystem:
             'redis_available': self.db_manager.is_redis_available(),
             'file_cache_directory': str(self.cache_dir),
             'file_cache_count': len(list(self.cache_dir.glob("*.pkl"))),
+            'memory_cache': self.memory_cache.stats(),
         }
 
         total_size_bytes = 0
@@ -346,11 +732,12 @@ class AdaptiveCacheSystem:
             try:
                 db = mongodb_client.tradingagents
 
-                # 统计各个集合
+                # 统计各个集合（集合列表只查询一次；计数使用集合元数据，避免全表扫描）
+                existing_collections = set(db.list_collection_names())
                 for collection_name in ["stock_data", "news_data", "fundamentals_data"]:
-                    if collection_name in db.list_collection_names():
+                    if collection_name in existing_collections:
                         collection = db[collection_name]
-                        count = collection.count_documents({})
+                        count = collection.estimated_document_count()
 
                         # 获取集合大小
                         try:
@@ -412,9 +799,7 @@ class AdaptiveCacheSystem:
                 with open(cache_file, 'rb') as f:
                     cache_data = pickle.load(f)
                 
-                symbol = cache_data['metadata'].get('symbol', '')
-                data_type = cache_data['metadata'].get('data_type', 'stock_data')
-                ttl_seconds = self._get_ttl_seconds(symbol, data_type)
+                ttl_seconds = self._get_metadata_ttl(cache_data['metadata'])
                 
                 if not self._is_cache_valid(cache_data['timestamp'], ttl_seconds):
                     cache_file.unlink()
@@ -425,7 +810,16 @@ class AdaptiveCacheSystem:
         
         self.logger.info(f"文件缓存清理完成，删除 {cleared_files} 个过期文件")
         
-        # MongoDB会自动清理过期文档（通过expires_at字段）
+        # MongoDB会自动清理过期文档（通过 expires_at 上的 TTL 索引）；
+        # 旧版按本地时间写入 expires_at 的文档不会被读取，这里一并删除
+        mongodb_client = self.db_manager.get_mongodb_client()
+        if mongodb_client:
+            try:
+                result = mongodb_client.tradingagents.cache.delete_many({'expires_at_utc': {'$exists': False}})
+                self.logger.info(f"MongoDB旧版缓存清理完成，删除 {result.deleted_count} 条")
+            except Exception as e:
+                self.logger.error(f"MongoDB旧版缓存清理失败: {e}")
+
         # Redis会自动清理过期键
 
 
@@ -5,12 +5,13 @@ MongoDB + Redis 数据库缓存管理器
 """
 
 import os
-import json
 import pickle
 import hashlib
+from functools import lru_cache
 from datetime import datetime, timedelta
 from zoneinfo import ZoneInfo
 from tradingagents.config.runtime_settings import get_timezone_name
+from tradingagents.utils import fast_json
 
 from typing import Optional, Dict, Any, List, Union
 import pandas as pd
@@ -38,6 +39,18 @@ except ImportError:
     logger.warning(f"⚠️ redis 未安装，Redis功能不可用")
 
 
+@lru_cache(maxsize=65536)
+def _make_cache_key(data_type: str, symbol: str, params: tuple) -> str:
+    """生成缓存键（记忆化：同一参数组合只计算一次 md5）"""
+    # 创建一个包含所有参数的字符串
+    params_str = f"{data_type}_{symbol}"
+    for key, value in params:
+        params_str += f"_{key}_{value}"
+
+    cache_key = hashlib.md5(params_str.encode(), usedforsecurity=False).hexdigest()[:16]
+    return f"{data_type}:{symbol}:{cache_key}"
+
+
 class DatabaseCacheManager:
     """MongoDB + Redis 数据库缓存管理器"""
 
@@ -174,12 +187,12 @@ class DatabaseCacheManager:
 
     def _generate_cache_key(self, data_type: str, symbol: str, **kwargs) -> str:
         """生成缓存键"""
-        params_str = f"{data_type}_{symbol}"
-        for key, value in sorted(kwargs.items()):
-            params_str += f"_{key}_{value}"
-
-        cache_key = hashlib.md5(params_str.encode()).hexdigest()[:16]
-        return f"{data_type}:{symbol}:{cache_key}"
+        params = tuple(sorted(kwargs.items()))
+        try:
+            return _make_cache_key(data_type, symbol, params)
+        except TypeError:
+            # 参数值不可哈希（如 list）时无法记忆化，直接计算
+            return _make_cache_key.__wrapped__(data_type, symbol, params)
 
     def save_stock_data(self, symbol: str, data: Union[pd.DataFrame, str],
                        start_date: str = None, end_date: str = None,
@@ -213,7 +226,8 @@ class DatabaseCacheManager:
             else:  # 其他格式为美股
                 market_type = "us"
 
-        # 准备文档数据
+        # 准备文档数据（created_at / updated_at 共用同一时刻）
+        now = datetime.now(ZoneInfo(get_timezone_name()))
         doc = {
             "_id": cache_key,
             "symbol": symbol,
@@ -222,8 +236,8 @@ class DatabaseCacheManager:
             "start_date": start_date,
             "end_date": end_date,
             "data_source": data_source,
-            "created_at": datetime.now(ZoneInfo(get_timezone_name())),
-            "updated_at": datetime.now(ZoneInfo(get_timezone_name()))
+            "created_at": now,
+            "updated_at": now
         }
 
         # 处理数据格式
@@ -256,7 +270,7 @@ class DatabaseCacheManager:
                 self.redis_client.setex(
                     cache_key,
                     6 * 3600,  # 6小时过期
-                    json.dumps(redis_data, ensure_ascii=False)
+                    fast_json.dumps(redis_data)
                 )
                 logger.info(f"⚡ 股票数据已缓存到Redis: {symbol} -> {cache_key}")
             except Exception as e:
@@ -272,7 +286,7 @@ class DatabaseCacheManager:
             try:
                 redis_data = self.redis_client.get(cache_key)
                 if redis_data:
-                    data_dict = json.loads(redis_data)
+                    data_dict = fast_json.loads(redis_data)
                     logger.info(f"⚡ 从Redis加载数据: {cache_key}")
 
                     if data_dict["data_format"] == "dataframe_json":
@@ -304,7 +318,7 @@ class DatabaseCacheManager:
                             self.redis_client.setex(
                                 cache_key,
                                 6 * 3600,
-                                json.dumps(redis_data, ensure_ascii=False)
+                                fast_json.dumps(redis_data)
                             )
                             logger.info(f"⚡ 数据已同步到Redis缓存")
                         except Exception as e:
@@ -376,6 +390,7 @@ class DatabaseCacheManager:
                                            end_date=end_date,
                                            source=data_source)
 
+        now = datetime.now(ZoneInfo(get_timezone_name()))
         doc = {
             "_id": cache_key,
             "symbol": symbol,
@@ -385,8 +400,8 @@ class DatabaseCacheManager:
             "end_date": end_date,
             "data_source": data_source,
             "data": news_data,
-            "created_at": datetime.now(ZoneInfo(get_timezone_name())),
-            "updated_at": datetime.now(ZoneInfo(get_timezone_name()))
+            "created_at": now,
+            "updated_at": now
         }
 
         # 保存到MongoDB
@@ -410,7 +425,7 @@ class DatabaseCacheManager:
                 self.redis_client.setex(
                     cache_key,
                     24 * 3600,  # 24小时过期
-                    json.dumps(redis_data, ensure_ascii=False)
+                    fast_json.dumps(redis_data)
                 )
                 logger.info(f"⚡ 新闻数据已缓存到Redis: {symbol} -> {cache_key}")
             except Exception as e:
@@ -422,8 +437,9 @@ class DatabaseCacheManager:
                               analysis_date: str = None,
                               data_source: str = "unknown") -> str:
         """保存基本面数据到MongoDB和Redis"""
+        now = datetime.now(ZoneInfo(get_timezone_name()))
         if not analysis_date:
-            analysis_date = datetime.now(ZoneInfo(get_timezone_name())).strftime("%Y-%m-%d")
+            analysis_date = now.strftime("%Y-%m-%d")
 
         cache_key = self._generate_cache_key("fundamentals", symbol,
                                            date=analysis_date,
@@ -436,8 +452,8 @@ class DatabaseCacheManager:
             "analysis_date": analysis_date,
             "data_source": data_source,
             "data": fundamentals_data,
-            "created_at": datetime.now(ZoneInfo(get_timezone_name())),
-            "updated_at": datetime.now(ZoneInfo(get_timezone_name()))
+            "created_at": now,
+            "updated_at": now
         }
 
         # 保存到MongoDB
@@ -462,7 +478,7 @@ class DatabaseCacheManager:
                 self.redis_client.setex(
                     cache_key,
                     24 * 3600,  # 24小时过期
-                    json.dumps(redis_data, ensure_ascii=False)
+                    fast_json.dumps(redis_data)
                 )
                 logger.info(f"⚡ 基本面数据已缓存到Redis: {symbol} -> {cache_key}")
             except Exception as e:
@@ -495,7 +511,8 @@ class DatabaseCacheManager:
             try:
                 for collection_name in ["stock_data", "news_data", "fundamentals_data"]:
                     collection = self.mongodb_db[collection_name]
-                    count = collection.count_documents({})
+                    # 使用集合元数据计数（O(1)），避免 count_documents({}) 全表扫描
+                    count = collection.estimated_document_count()
                     size = self.mongodb_db.command("collStats", collection_name).get("size", 0)
                     backend_info["mongodb"]["collections"][collection_name] = {
                         "count": count,
@@ -12,12 +12,26 @@ from datetime import datetime, timedelta
 from pathlib import Path
 from typing import Optional, Dict, Any, Union, List
 import hashlib
+from functools import lru_cache
 
 # 导入日志模块
 from tradingagents.utils.logging_manager import get_logger
 logger = get_logger('agents')
 
 
+@lru_cache(maxsize=65536)
+def _make_cache_key(data_type: str, symbol: str, params: tuple) -> str:
+    """生成缓存键（记忆化：同一参数组合只计算一次 md5）"""
+    # 创建一个包含所有参数的字符串
+    params_str = f"{data_type}_{symbol}"
+    for key, value in params:
+        params_str += f"_{key}_{value}"
+
+    # 使用MD5生成短的唯一标识（非安全用途）
+    cache_key = hashlib.md5(params_str.encode(), usedforsecurity=False).hexdigest()[:12]
+    return f"{symbol}_{data_type}_{cache_key}"
+
+
 class StockDataCache:
     """股票数据缓存管理器 - 支持美股和A股数据缓存优化"""
 
@@ -175,14 +189,12 @@ class StockDataCache:
     
     def _generate_cache_key(self, data_type: str, symbol: str, **kwargs) -> str:
         """生成缓存键"""
-        # 创建一个包含所有参数的字符串
-        params_str = f"{data_type}_{symbol}"
-        for key, value in sorted(kwargs.items()):
-            params_str += f"_{key}_{value}"
-        
-        # 使用MD5生成短的唯一标识
-        cache_key = hashlib.md5(params_str.encode()).hexdigest()[:12]
-        return f"{symbol}_{data_type}_{cache_key}"
+        params = tuple(sorted(kwargs.items()))
+        try:
+            return _make_cache_key(data_type, symbol, params)
+        except TypeError:
+            # 参数值不可哈希（如 list）时无法记忆化，直接计算
+            return _make_cache_key.__wrapped__(data_type, symbol, params)
     
     def _get_cache_path(self, data_type: str, cache_key: str, file_format: str = "json", symbol: str = None) -> Path:
         """获取缓存文件路径 - 支持市场分类"""
@@ -220,12 +232,12 @@ class StockDataCache:
     def _load_metadata(self, cache_key: str) -> Optional[Dict[str, Any]]:
         """加载元数据"""
         metadata_path = self._get_metadata_path(cache_key)
-        if not metadata_path.exists():
-            return None
-        
+        # 直接打开，不存在时捕获 FileNotFoundError（省去一次 exists 系统调用）
         try:
             with open(metadata_path, 'r', encoding='utf-8') as f:
                 return json.load(f)
+        except FileNotFoundError:
+            return None
         except Exception as e:
             logger.error(f"⚠️ 加载元数据失败: {e}")
             return None
@@ -338,15 +350,14 @@ class StockDataCache:
             return None
         
         cache_path = Path(metadata['file_path'])
-        if not cache_path.exists():
-            return None
-        
         try:
             if metadata['file_format'] == 'csv':
                 return pd.read_csv(cache_path, index_col=0)
             else:
                 with open(cache_path, 'r', encoding='utf-8') as f:
                     return f.read()
+        except FileNotFoundError:
+            return None
         except Exception as e:
             logger.error(f"⚠️ 加载缓存数据失败: {e}")
             return None
@@ -498,12 +509,11 @@ class StockDataCache:
             return None
         
         cache_path = Path(metadata['file_path'])
-        if not cache_path.exists():
-            return None
-        
         try:
             with open(cache_path, 'r', encoding='utf-8') as f:
                 return f.read()
+        except FileNotFoundError:
+            return None
         except Exception as e:
             logger.error(f"⚠️ 加载基本面缓存数据失败: {e}")
             return None
@@ -8,7 +8,7 @@
 import os
 import logging
 from pathlib import Path
-from typing import Any, Dict, Optional, Union
+from typing import Any, Dict, List, Optional, Union
 import pandas as pd
 
 # 导入统一日志系统
@@ -105,6 +105,64 @@ class IntegratedCacheManager:
                 data_source=data_source
             )
     
+    def save_stock_data_many(self, items: Dict[str, Any], start_date: str = None,
+                             end_date: str = None, data_source: str = "default") -> Dict[str, str]:
+        """
+        批量保存同一时间区间的多只股票数据
+        
+        Args:
+            items: {股票代码: 股票数据}
+            start_date: 开始日期
+            end_date: 结束日期
+            data_source: 数据源
+            
+        Returns:
+            {股票代码: 缓存键}
+        """
+        if self.use_adaptive:
+            # 自适应缓存一次往返批量写入
+            return self.adaptive_cache.save_data_many(
+                items,
+                start_date=start_date or "",
+                end_date=end_date or "",
+                data_source=data_source,
+                data_type="stock_data"
+            )
+        return {
+            symbol: self.legacy_cache.save_stock_data(
+                symbol=symbol,
+                data=data,
+                start_date=start_date,
+                end_date=end_date,
+                data_source=data_source
+            )
+            for symbol, data in items.items()
+        }
+    
+    def load_stock_data_many(self, symbols: List[str], start_date: str = None,
+                             end_date: str = None, data_source: str = "default") -> Dict[str, Any]:
+        """
+        批量加载同一时间区间的多只股票数据
+        
+        Returns:
+            {股票代码: 股票数据}，只包含命中的股票
+        """
+        if self.use_adaptive:
+            keys = {
+                self.adaptive_cache._get_cache_key(symbol, start_date or "", end_date or "", data_source, "stock_data"): symbol
+                for symbol in symbols
+            }
+            hits = self.adaptive_cache.load_data_many(list(keys))
+            return {keys[cache_key]: data for cache_key, data in hits.items()}
+        results = {}
+        for symbol in symbols:
+            cache_key = self.find_cached_stock_data(symbol, start_date, end_date, data_source)
+            if cache_key:
+                data = self.load_stock_data(cache_key)
+                if data is not None:
+                    results[symbol] = data
+        return results
+    
     def load_stock_data(self, cache_key: str) -> Optional[Any]:
         """
         从缓存加载股票数据
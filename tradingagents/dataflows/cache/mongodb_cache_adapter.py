@@ -4,6 +4,8 @@ MongoDB 缓存适配器
 根据 TA_USE_APP_CACHE 配置，优先使用 MongoDB 中的同步数据
 """
 
+import threading
+
 import pandas as pd
 from typing import Optional, Dict, Any, List, Union
 from datetime import datetime, timedelta, timezone
@@ -158,7 +160,7 @@ class MongoDBCacheAdapter:
         return ['tushare', 'akshare', 'baostock']
 
     def get_historical_data(self, symbol: str, start_date: str = None, end_date: str = None,
-                          period: str = "daily") -> Optional[pd.DataFrame]:
+                          period: str = "daily", limit: Optional[int] = None) -> Optional[pd.DataFrame]:
         """
         获取历史数据，支持多周期，按数据源优先级查询
 
@@ -167,6 +169,7 @@ class MongoDBCacheAdapter:
             start_date: 开始日期
             end_date: 结束日期
             period: 数据周期（daily/weekly/monthly），默认为daily
+            limit: 只取区间内最近的 limit 条（在数据库端截取），默认全部
 
         Returns:
             DataFrame: 历史数据
@@ -200,8 +203,14 @@ class MongoDBCacheAdapter:
 
                 # 查询数据
                 logger.debug(f"🔍 [MongoDB查询] 尝试数据源: {data_source}, symbol={code6}, period={period}")
-                cursor = collection.find(query, {"_id": 0}).sort("trade_date", 1)
-                data = list(cursor)
+                if limit:
+                    # 在数据库端截取最近 limit 条，DataFrame 只包含需要的行
+                    cursor = collection.find(query, {"_id": 0}).sort("trade_date", -1).limit(int(limit))
+                    data = list(cursor)
+                    data.reverse()
+                else:
+                    cursor = collection.find(query, {"_id": 0}).sort("trade_date", 1)
+                    data = list(cursor)
 
                 if data:
                     df = pd.DataFrame(data)
@@ -350,13 +359,18 @@ class MongoDBCacheAdapter:
 
 # 全局实例
 _mongodb_cache_adapter = None
+_mongodb_cache_adapter_lock = threading.Lock()
 
 def get_mongodb_cache_adapter() -> MongoDBCacheAdapter:
-    """获取 MongoDB 缓存适配器实例"""
+    """获取 MongoDB 缓存适配器实例（线程安全，只初始化一次）"""
     global _mongodb_cache_adapter
-    if _mongodb_cache_adapter is None:
-        _mongodb_cache_adapter = MongoDBCacheAdapter()
-    return _mongodb_cache_adapter
+    adapter = _mongodb_cache_adapter
+    if adapter is None:
+        with _mongodb_cache_adapter_lock:
+            if _mongodb_cache_adapter is None:
+                _mongodb_cache_adapter = MongoDBCacheAdapter()
+            adapter = _mongodb_cache_adapter
+    return adapter
 
 # 向后兼容的别名
 def get_enhanced_data_adapter() -> MongoDBCacheAdapter:
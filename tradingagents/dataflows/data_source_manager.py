@@ -4,7 +4,9 @@
 统一管理中国股票数据源的选择和切换，支持Tushare、AKShare、BaoStock等
 """
 
+import asyncio
 import os
+import threading
 import time
 from typing import Dict, List, Optional, Any
 from enum import Enum
@@ -719,25 +721,25 @@ class DataSourceManager:
             # RSI6 - 使用中国式SMA
             avg_gain6 = gain.ewm(com=5, adjust=True).mean()  # com = N - 1
             avg_loss6 = loss.ewm(com=5, adjust=True).mean()
-            rs6 = avg_gain6 / avg_loss6.replace(0, np.nan)
+            rs6 = avg_gain6 / np.where(avg_loss6 == 0, np.nan, avg_loss6)
             data['rsi6'] = 100 - (100 / (1 + rs6))
 
             # RSI12 - 使用中国式SMA
             avg_gain12 = gain.ewm(com=11, adjust=True).mean()
             avg_loss12 = loss.ewm(com=11, adjust=True).mean()
-            rs12 = avg_gain12 / avg_loss12.replace(0, np.nan)
+            rs12 = avg_gain12 / np.where(avg_loss12 == 0, np.nan, avg_loss12)
             data['rsi12'] = 100 - (100 / (1 + rs12))
 
             # RSI24 - 使用中国式SMA
             avg_gain24 = gain.ewm(com=23, adjust=True).mean()
             avg_loss24 = loss.ewm(com=23, adjust=True).mean()
-            rs24 = avg_gain24 / avg_loss24.replace(0, np.nan)
+            rs24 = avg_gain24 / np.where(avg_loss24 == 0, np.nan, avg_loss24)
             data['rsi24'] = 100 - (100 / (1 + rs24))
 
             # 保留RSI14作为国际标准参考（使用简单移动平均）
             gain14 = gain.rolling(window=14, min_periods=1).mean()
             loss14 = loss.rolling(window=14, min_periods=1).mean()
-            rs14 = gain14 / loss14.replace(0, np.nan)
+            rs14 = gain14 / np.where(loss14 == 0, np.nan, loss14)
             data['rsi14'] = 100 - (100 / (1 + rs14))
 
             # 计算MACD
@@ -984,6 +986,56 @@ class DataSourceManager:
             logger.error(f"❌ [DataFrame接口] 获取失败: {e}", exc_info=True)
             return pd.DataFrame()
 
+    async def get_stock_dataframes_many(self, symbols: List[str], start_date: str = None, end_date: str = None,
+                                        period: str = "daily", concurrency: int = 16) -> Dict[str, pd.DataFrame]:
+        """
+        并发获取多只股票的 DataFrame
+
+        get_stock_dataframe 是同步接口，逐只调用时总耗时是 N 次上游往返之和；
+        这里用 asyncio.to_thread 把每次调用放到线程池，并用信号量限制同时在途的请求数，避免触发数据源限流。
+        启用统一缓存时先批量读取缓存，只请求未命中的股票，新取到的数据再批量写回缓存。
+
+        Args:
+            symbols: 股票代码列表
+            start_date: 开始日期
+            end_date: 结束日期
+            period: 数据周期（daily/weekly/monthly），默认为daily
+            concurrency: 最大并发数，默认16
+
+        Returns:
+            Dict[str, pd.DataFrame]: 股票代码 -> DataFrame（获取失败时为空 DataFrame）
+        """
+        cache_source = f"dataframe_{period}"
+        # 只有集成缓存（IntegratedCacheManager）提供批量接口
+        batch_cache = self.cache_manager if self.cache_enabled and hasattr(self.cache_manager, 'save_stock_data_many') else None
+        cached: Dict[str, pd.DataFrame] = {}
+        if batch_cache:
+            try:
+                cached = await asyncio.to_thread(
+                    batch_cache.load_stock_data_many, symbols, start_date, end_date, cache_source
+                )
+            except Exception as e:
+                logger.warning(f"⚠️ 批量读取缓存失败: {e}")
+        missing = [symbol for symbol in symbols if symbol not in cached]
+
+        semaphore = asyncio.Semaphore(max(1, concurrency))
+
+        async def fetch_one(symbol: str) -> pd.DataFrame:
+            async with semaphore:
+                return await asyncio.to_thread(self.get_stock_dataframe, symbol, start_date, end_date, period)
+
+        frames = await asyncio.gather(*(fetch_one(symbol) for symbol in missing))
+        fetched = dict(zip(missing, frames))
+
+        fresh = {symbol: df for symbol, df in fetched.items() if df is not None and not df.empty}
+        if fresh and batch_cache:
+            try:
+                await asyncio.to_thread(batch_cache.save_stock_data_many, fresh, start_date, end_date, cache_source)
+            except Exception as e:
+                logger.warning(f"⚠️ 批量保存缓存失败: {e}")
+
+        return {symbol: cached[symbol] if symbol in cached else fetched[symbol] for symbol in symbols}
+
     def _standardize_dataframe(self, df: pd.DataFrame) -> pd.DataFrame:
         """
         标准化 DataFrame 列名和格式
@@ -997,8 +1049,6 @@ class DataSourceManager:
         if df is None or df.empty:
             return pd.DataFrame()
 
-        out = df.copy()
-
         # 列名映射
         colmap = {
             # English
@@ -1012,13 +1062,15 @@ class DataSourceManager:
             '日期': 'date', '开盘': 'open', '最高': 'high', '最低': 'low', '收盘': 'close',
             '成交量': 'vol', '成交额': 'amount', '涨跌幅': 'pct_change', '涨跌额': 'change',
         }
-        out = out.rename(columns={c: colmap.get(c, c) for c in out.columns})
+        # rename 本身返回新对象，后续修改不会影响调用方传入的 df，无需再 copy 一次
+        out = df.rename(columns={c: colmap.get(c, c) for c in df.columns})
 
-        # 确保日期排序
+        # 确保日期排序（数据源大多已按日期升序返回，单次遍历确认有序后即可跳过排序和整表重排）
         if 'date' in out.columns:
             try:
                 out['date'] = pd.to_datetime(out['date'])
-                out = out.sort_values('date')
+                if not out['date'].is_monotonic_increasing:
+                    out = out.sort_values('date', kind='stable')
             except Exception:
                 pass
 
@@ -2129,13 +2181,18 @@ class DataSourceManager:
 
 # 全局数据源管理器实例
 _data_source_manager = None
+_data_source_manager_lock = threading.Lock()
 
 def get_data_source_manager() -> DataSourceManager:
-    """获取全局数据源管理器实例"""
+    """获取全局数据源管理器实例（线程安全，筛选等场景会在线程池中并发调用）"""
     global _data_source_manager
-    if _data_source_manager is None:
-        _data_source_manager = DataSourceManager()
-    return _data_source_manager
+    manager = _data_source_manager
+    if manager is None:
+        with _data_source_manager_lock:
+            if _data_source_manager is None:
+                _data_source_manager = DataSourceManager()
+            manager = _data_source_manager
+    return manager
 
 
 def get_china_stock_data_unified(symbol: str, start_date: str, end_date: str) -> str:
@@ -2189,15 +2246,6 @@ def get_china_stock_info_unified(symbol: str) -> Dict:
     return manager.get_stock_info(symbol)
 
 
-# 全局数据源管理器实例
-_data_source_manager = None
-
-def get_data_source_manager() -> DataSourceManager:
-    """获取全局数据源管理器实例"""
-    global _data_source_manager
-    if _data_source_manager is None:
-        _data_source_manager = DataSourceManager()
-    return _data_source_manager
 
 # ==================== 兼容性接口 ====================
 # 为了兼容 stock_data_service，提供相同的接口
@@ -312,9 +312,9 @@ class RealtimeNewsAggregator:
             # 1. 尝试使用AKShare获取东方财富个股新闻
             try:
                 logger.info(f"[中文财经新闻] 尝试通过 AKShare Provider 获取新闻")
-                from tradingagents.dataflows.providers.china.akshare import AKShareProvider
+                from tradingagents.dataflows.providers.china.akshare import get_akshare_provider
 
-                provider = AKShareProvider()
+                provider = get_akshare_provider()
 
                 # 处理股票代码格式
                 # 如果是美股代码，不使用东方财富新闻
@@ -740,10 +740,10 @@ def get_realtime_stock_news(ticker: str, curr_date: str, hours_back: int = 6) ->
         logger.info(f"[新闻分析] 检测到A股股票 {ticker}，优先尝试使用东方财富新闻源")
         try:
             logger.info(f"[新闻分析] 尝试通过 AKShare Provider 获取新闻")
-            from tradingagents.dataflows.providers.china.akshare import AKShareProvider
+            from tradingagents.dataflows.providers.china.akshare import get_akshare_provider
 
-            provider = AKShareProvider()
-            logger.info(f"[新闻分析] 成功创建 AKShare Provider 实例")
+            provider = get_akshare_provider()
+            logger.info(f"[新闻分析] 成功获取 AKShare Provider 实例")
 
             # 处理A股代码
             clean_ticker = ticker.replace('.SH', '').replace('.SZ', '').replace('.SS', '')\
@@ -861,9 +861,9 @@ def get_realtime_stock_news(ticker: str, curr_date: str, hours_back: int = 6) ->
     if not is_china_stock and '.HK' in ticker:
         logger.info(f"[新闻分析] 检测到港股代码 {ticker}，尝试使用东方财富新闻源")
         try:
-            from tradingagents.dataflows.providers.china.akshare import AKShareProvider
+            from tradingagents.dataflows.providers.china.akshare import get_akshare_provider
 
-            provider = AKShareProvider()
+            provider = get_akshare_provider()
 
             # 处理港股代码
             clean_ticker = ticker.replace('.HK', '')
@@ -53,9 +53,27 @@ class AKShareProvider(BaseStockDataProvider):
             # 修复AKShare的bug：设置requests的默认headers，并添加请求延迟
             # AKShare的stock_news_em()函数没有设置必要的headers，导致API返回空响应
             if not hasattr(requests, '_akshare_headers_patched'):
-                original_get = requests.get
+                import threading
+                from requests.adapters import HTTPAdapter
+
                 last_request_time = {'time': 0}  # 使用字典以便在闭包中修改
 
+                # 复用 keep-alive 连接：AKShare 内部直接调用 requests.get，每次都会重新建立 TCP/TLS 连接
+                http_session = requests.Session()
+                http_adapter = HTTPAdapter(pool_connections=20, pool_maxsize=50)
+                http_session.mount('https://', http_adapter)
+                http_session.mount('http://', http_adapter)
+
+                # curl_cffi 会话不是线程安全的，按线程各持有一个
+                curl_local = threading.local()
+
+                def get_curl_session():
+                    session = getattr(curl_local, 'session', None)
+                    if session is None:
+                        session = curl_requests.Session(impersonate="chrome120")
+                        curl_local.session = session
+                    return session
+
                 def patched_get(url, **kwargs):
                     """
                     包装requests.get方法，自动添加必要的headers和请求延迟
@@ -90,7 +108,7 @@ class AKShareProvider(BaseStockDataProvider):
                             if 'json' in kwargs:
                                 curl_kwargs['json'] = kwargs['json']
 
-                            response = curl_requests.get(url, **curl_kwargs)
+                            response = get_curl_session().get(url, **curl_kwargs)
                             # curl_cffi 的响应对象已经兼容 requests.Response
                             return response
                         except Exception as e:
@@ -126,7 +144,7 @@ class AKShareProvider(BaseStockDataProvider):
                     max_retries = 3
                     for attempt in range(max_retries):
                         try:
-                            return original_get(url, **kwargs)
+                            return http_session.get(url, **kwargs)
                         except Exception as e:
                             # 检查是否是SSL错误
                             error_str = str(e)
@@ -331,14 +349,14 @@ class AKShareProvider(BaseStockDataProvider):
                 logger.warning("⚠️ AKShare股票列表为空")
                 return []
 
-            # 转换为标准格式
-            stock_list = []
-            for _, row in stock_df.iterrows():
-                stock_list.append({
-                    "code": str(row.get("code", "")),
-                    "name": str(row.get("name", "")),
-                    "source": "akshare"
-                })
+            # 转换为标准格式（按列批量转换，避免逐行 iterrows）
+            row_count = len(stock_df)
+            codes = stock_df["code"].astype(str).tolist() if "code" in stock_df.columns else [""] * row_count
+            names = stock_df["name"].astype(str).tolist() if "name" in stock_df.columns else [""] * row_count
+            stock_list = [
+                {"code": code, "name": name, "source": "akshare"}
+                for code, name in zip(codes, names)
+            ]
 
             logger.info(f"✅ AKShare股票列表获取成功: {len(stock_list)}只股票")
             return stock_list
@@ -616,16 +634,16 @@ class AKShareProvider(BaseStockDataProvider):
                     for prefix in ['sh', 'sz', 'bj']:
                         code_mapping[f"{prefix}{code}"] = code
 
-                for _, row in spot_df.iterrows():
-                    raw_code = str(row.get("代码", ""))
-
-                    # 尝试匹配代码（支持带前缀和不带前缀）
-                    matched_code = None
-                    if raw_code in code_mapping:
-                        matched_code = code_mapping[raw_code]
-                    elif raw_code in codes_set:
-                        matched_code = raw_code
+                # 先按列批量匹配代码（支持带前缀和不带前缀），只遍历命中的行，
+                # 避免对全市场 5000+ 行快照逐行 iterrows
+                if "代码" in spot_df.columns:
+                    matched_codes = spot_df["代码"].astype(str).map(code_mapping)
+                else:
+                    matched_codes = pd.Series(None, index=spot_df.index, dtype=object)
+                hit_mask = matched_codes.notna()
+                hit_rows = spot_df[hit_mask].to_dict("records")
 
+                for matched_code, row in zip(matched_codes[hit_mask].tolist(), hit_rows):
                     if matched_code:
                         quotes_data = {
                             "name": str(row.get("名称", f"股票{matched_code}")),
@@ -985,11 +1003,10 @@ class AKShareProvider(BaseStockDataProvider):
             if 'date' in df.columns:
                 df['date'] = pd.to_datetime(df['date'])
 
-            # 数据类型转换
-            numeric_columns = ['open', 'close', 'high', 'low', 'volume', 'amount']
-            for col in numeric_columns:
-                if col in df.columns:
-                    df[col] = pd.to_numeric(df[col], errors='coerce').fillna(0)
+            # 数据类型转换（一次性批量转换所有数值列）
+            numeric_columns = [col for col in ['open', 'close', 'high', 'low', 'volume', 'amount'] if col in df.columns]
+            if numeric_columns:
+                df[numeric_columns] = df[numeric_columns].apply(pd.to_numeric, errors='coerce').fillna(0)
 
             return df
 
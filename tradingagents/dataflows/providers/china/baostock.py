@@ -609,10 +609,11 @@ class BaoStockProvider(BaseStockDataProvider):
             df = pd.DataFrame(data_list, columns=fields)
 
             # 数据类型转换
-            numeric_cols = ['open', 'high', 'low', 'close', 'preclose', 'volume', 'amount', 'pctChg', 'turn']
-            for col in numeric_cols:
-                if col in df.columns:
-                    df[col] = pd.to_numeric(df[col], errors='coerce')
+            # 一次性批量转换所有数值列，避免逐列/逐行 Python 级转换
+            numeric_cols = [col for col in ['open', 'high', 'low', 'close', 'preclose', 'volume', 'amount', 'pctChg', 'turn']
+                            if col in df.columns]
+            if numeric_cols:
+                df[numeric_cols] = df[numeric_cols].apply(pd.to_numeric, errors='coerce')
 
             # 如果没有preclose字段，使用前一日收盘价估算
             if 'preclose' not in df.columns and len(df) > 0:
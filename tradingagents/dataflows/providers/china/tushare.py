@@ -309,11 +309,8 @@ class TushareProvider(BaseStockDataProvider):
             if df is None or df.empty:
                 return None
             
-            # 转换为标准格式
-            stock_list = []
-            for _, row in df.iterrows():
-                stock_info = self.standardize_basic_info(row.to_dict())
-                stock_list.append(stock_info)
+            # 转换为标准格式（to_dict 一次性转换，避免逐行 iterrows）
+            stock_list = [self.standardize_basic_info(row) for row in df.to_dict("records")]
             
             self.logger.info(f"✅ 获取股票列表: {len(stock_list)}只")
             return stock_list
@@ -446,7 +443,7 @@ class TushareProvider(BaseStockDataProvider):
 
             # 转换为字典格式
             result = {}
-            for _, row in df.iterrows():
+            for row in df.to_dict("records"):
                 ts_code = row.get('ts_code')
                 if not ts_code or '.' not in ts_code:
                     continue
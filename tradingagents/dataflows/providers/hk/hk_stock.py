@@ -276,7 +276,7 @@ class HKStockProvider:
             delta = data['Close'].diff()
             gain = (delta.where(delta > 0, 0)).rolling(window=14, min_periods=1).mean()
             loss = (-delta.where(delta < 0, 0)).rolling(window=14, min_periods=1).mean()
-            rs = gain / (loss.replace(0, np.nan))
+            rs = gain / np.where(loss == 0, np.nan, loss)
             data['rsi'] = 100 - (100 / (1 + rs))
 
             # 计算MACD
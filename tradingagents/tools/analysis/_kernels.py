@@ -0,0 +1,294 @@
+"""
+技术指标滑动窗口 / 递推内核（可选 numba 加速）
+
+安装了 numba 时，这里的函数会被 @njit 编译为机器码，indicators.py 会优先调用它们；
+未安装时 NUMBA_AVAILABLE 为 False，indicators.py 继续使用 pandas rolling / ewm 实现。
+
+所有滑动窗口内核的 NaN / min_periods 语义与 pandas ``rolling(window, min_periods)`` 保持一致：
+窗口内有效（非 NaN）观测数不少于 min_periods 时才输出数值；ewm_mean 与 pandas ``ewm().mean()`` 一致。
+"""
+from __future__ import annotations
+
+import numpy as np
+
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:  # pragma: no cover - 未安装 numba 时退回 pandas 实现
+    NUMBA_AVAILABLE = False
+
+    def njit(*args, **kwargs):
+        """numba 不可用时的空装饰器"""
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+
+        def decorator(func):
+            return func
+        return decorator
+
+
+# 注意：不启用 fastmath，它会假设输入不含 NaN，从而破坏缺失值处理
+
+
+@njit(cache=True)
+def rolling_mean(x, window, min_periods):
+    """滑动均值，O(n) 单次遍历"""
+    n = x.shape[0]
+    out = np.empty(n, dtype=np.float64)
+    total = 0.0
+    count = 0
+    for i in range(n):
+        v = x[i]
+        if not np.isnan(v):
+            total += v
+            count += 1
+        if i >= window:
+            old = x[i - window]
+            if not np.isnan(old):
+                total -= old
+                count -= 1
+        if count >= min_periods and count > 0:
+            out[i] = total / count
+        else:
+            out[i] = np.nan
+    return out
+
+
+@njit(cache=True)
+def _welford_add(count, mean, m2, v):
+    """Welford 增量：窗口加入 v，返回新的 (count, mean, m2)"""
+    count += 1
+    delta = v - mean
+    mean += delta / count
+    m2 += delta * (v - mean)
+    return count, mean, m2
+
+
+@njit(cache=True)
+def _welford_remove(count, mean, m2, old):
+    """Welford 增量：窗口移出 old，返回新的 (count, mean, m2)"""
+    if count == 1:
+        return 0, 0.0, 0.0
+    delta = old - mean
+    mean -= delta / (count - 1)
+    m2 -= delta * (old - mean)
+    return count - 1, mean, m2
+
+
+@njit(cache=True)
+def _welford_std(count, m2, min_periods):
+    """由 Welford 状态得到样本标准差（ddof=1），观测不足时为 NaN"""
+    if count >= min_periods and count > 1:
+        var = m2 / (count - 1)
+        return np.sqrt(var) if var > 0.0 else 0.0
+    return np.nan
+
+
+@njit(cache=True)
+def rolling_std(x, window, min_periods):
+    """滑动样本标准差（ddof=1），Welford 增量算法"""
+    n = x.shape[0]
+    out = np.empty(n, dtype=np.float64)
+    mean = 0.0
+    m2 = 0.0
+    count = 0
+    for i in range(n):
+        v = x[i]
+        if not np.isnan(v):
+            count, mean, m2 = _welford_add(count, mean, m2, v)
+        if i >= window:
+            old = x[i - window]
+            if not np.isnan(old):
+                count, mean, m2 = _welford_remove(count, mean, m2, old)
+        out[i] = _welford_std(count, m2, min_periods)
+    return out
+
+
+@njit(cache=True)
+def _rolling_extreme(x, window, min_periods, is_max):
+    """单调队列求滑动最值，O(n)"""
+    n = x.shape[0]
+    out = np.empty(n, dtype=np.float64)
+    dq = np.empty(n, dtype=np.int64)
+    head = 0
+    tail = 0
+    count = 0
+    for i in range(n):
+        v = x[i]
+        if not np.isnan(v):
+            count += 1
+            if is_max:
+                while tail > head and x[dq[tail - 1]] <= v:
+                    tail -= 1
+            else:
+                while tail > head and x[dq[tail - 1]] >= v:
+                    tail -= 1
+            dq[tail] = i
+            tail += 1
+        if i >= window:
+            if not np.isnan(x[i - window]):
+                count -= 1
+            while tail > head and dq[head] <= i - window:
+                head += 1
+        if count >= min_periods and tail > head:
+            out[i] = x[dq[head]]
+        else:
+            out[i] = np.nan
+    return out
+
+
+@njit(cache=True)
+def rolling_max(x, window, min_periods):
+    """滑动最大值"""
+    return _rolling_extreme(x, window, min_periods, True)
+
+
+@njit(cache=True)
+def rolling_min(x, window, min_periods):
+    """滑动最小值"""
+    return _rolling_extreme(x, window, min_periods, False)
+
+
+@njit(cache=True)
+def _ewm_update(weighted, old_wt, cur, alpha, adjust):
+    """ewm_mean 的单步递推，返回新的 (weighted, old_wt)"""
+    is_observation = not np.isnan(cur)
+    if not np.isnan(weighted):
+        old_wt *= 1.0 - alpha
+        if is_observation:
+            new_wt = 1.0 if adjust else alpha
+            if weighted != cur:
+                weighted = (old_wt * weighted + new_wt * cur) / (old_wt + new_wt)
+            if adjust:
+                old_wt += new_wt
+            else:
+                old_wt = 1.0
+    elif is_observation:
+        weighted = cur
+    return weighted, old_wt
+
+
+@njit(cache=True)
+def ewm_mean(x, alpha, adjust):
+    """指数加权均值，逐元素复刻 pandas ``ewm(alpha=..., adjust=...).mean()``（ignore_na=False）"""
+    n = x.shape[0]
+    out = np.empty(n, dtype=np.float64)
+    if n == 0:
+        return out
+    weighted = x[0]
+    old_wt = 1.0
+    out[0] = weighted
+    for i in range(1, n):
+        weighted, old_wt = _ewm_update(weighted, old_wt, x[i], alpha, adjust)
+        out[i] = weighted
+    return out
+
+
+@njit(cache=True)
+def kdj_recurrence(rsv, alpha_k, alpha_d):
+    """KDJ 的 K/D 递推（初始值 50），RSV 为 NaN 的位置输出 NaN 且不推进状态"""
+    n = rsv.shape[0]
+    k = np.empty(n, dtype=np.float64)
+    d = np.empty(n, dtype=np.float64)
+    last_k = 50.0
+    last_d = 50.0
+    for i in range(n):
+        rv = rsv[i]
+        if np.isnan(rv):
+            k[i] = np.nan
+            d[i] = np.nan
+            continue
+        last_k = (1.0 - alpha_k) * last_k + alpha_k * rv
+        last_d = (1.0 - alpha_d) * last_d + alpha_d * last_k
+        k[i] = last_k
+        d[i] = last_d
+    return k, d
+
+
+@njit(cache=True)
+def fused_close_indicators(x, ma_windows, fast, slow, signal, boll_n, rsi_n):
+    """
+    一次遍历收盘价，同时算出 add_all_indicators 需要的收盘价类指标
+
+    所有递推状态（各周期窗口和、快慢线 EMA、DEA、布林带 Welford 状态、Wilder RSI 均值）
+    都在同一个循环里更新，收盘价只读一遍；各指标语义与单独计算时一致：
+    MA / 布林带标准差为 min_periods=1 的滑动窗口，EMA / DEA 为 adjust=False 的 ewm，
+    RSI 为 Wilder 平滑（ewm(alpha=1/n, adjust=False)），平均跌幅为 0 时输出 NaN。
+
+    Returns:
+        (ma, dif, dea, boll_std, rsi)，ma 的形状为 (len(ma_windows), n)
+    """
+    n = x.shape[0]
+    k = ma_windows.shape[0]
+    ma = np.empty((k, n), dtype=np.float64)
+    dif = np.empty(n, dtype=np.float64)
+    dea = np.empty(n, dtype=np.float64)
+    boll_std = np.empty(n, dtype=np.float64)
+    rsi = np.empty(n, dtype=np.float64)
+    if n == 0:
+        return ma, dif, dea, boll_std, rsi
+
+    alpha_fast = 2.0 / (fast + 1)
+    alpha_slow = 2.0 / (slow + 1)
+    alpha_signal = 2.0 / (signal + 1)
+    alpha_rsi = 1.0 / rsi_n
+
+    sums = np.zeros(k, dtype=np.float64)
+    counts = np.zeros(k, dtype=np.int64)
+    std_count = 0
+    std_mean = 0.0
+    std_m2 = 0.0
+
+    ema_fast = x[0]
+    wt_fast = 1.0
+    ema_slow = x[0]
+    wt_slow = 1.0
+    d = ema_fast - ema_slow
+    dea_v = d
+    wt_dea = 1.0
+    # 首行涨跌幅为 0（与 _gain_loss 一致）
+    avg_gain = 0.0
+    wt_gain = 1.0
+    avg_loss = 0.0
+    wt_loss = 1.0
+
+    for i in range(n):
+        v = x[i]
+        valid = not np.isnan(v)
+
+        for j in range(k):
+            w = ma_windows[j]
+            if valid:
+                sums[j] += v
+                counts[j] += 1
+            if i >= w:
+                old = x[i - w]
+                if not np.isnan(old):
+                    sums[j] -= old
+                    counts[j] -= 1
+            ma[j, i] = sums[j] / counts[j] if counts[j] > 0 else np.nan
+
+        if valid:
+            std_count, std_mean, std_m2 = _welford_add(std_count, std_mean, std_m2, v)
+        if i >= boll_n:
+            old = x[i - boll_n]
+            if not np.isnan(old):
+                std_count, std_mean, std_m2 = _welford_remove(std_count, std_mean, std_m2, old)
+        boll_std[i] = _welford_std(std_count, std_m2, 1)
+
+        if i > 0:
+            ema_fast, wt_fast = _ewm_update(ema_fast, wt_fast, v, alpha_fast, False)
+            ema_slow, wt_slow = _ewm_update(ema_slow, wt_slow, v, alpha_slow, False)
+            d = ema_fast - ema_slow
+            dea_v, wt_dea = _ewm_update(dea_v, wt_dea, d, alpha_signal, False)
+
+            delta = v - x[i - 1]
+            gain = delta if delta > 0 else 0.0
+            loss = -delta if delta < 0 else 0.0
+            avg_gain, wt_gain = _ewm_update(avg_gain, wt_gain, gain, alpha_rsi, False)
+            avg_loss, wt_loss = _ewm_update(avg_loss, wt_loss, loss, alpha_rsi, False)
+        dif[i] = d
+        dea[i] = dea_v
+        rsi[i] = np.nan if avg_loss == 0 else 100.0 - 100.0 / (1.0 + avg_gain / avg_loss)
+
+    return ma, dif, dea, boll_std, rsi
@@ -6,6 +6,8 @@ from typing import Any, Dict, Iterable, List, Optional
 import numpy as np
 import pandas as pd
 
+from . import _kernels
+
 
 @dataclass(frozen=True)
 class IndicatorSpec:
@@ -13,7 +15,7 @@ class IndicatorSpec:
     params: Optional[Dict[str, Any]] = None
 
 
-SUPPORTED = {"ma", "ema", "macd", "rsi", "boll", "atr", "kdj"}
+SUPPORTED = frozenset({"ma", "ema", "macd", "rsi", "boll", "atr", "kdj"})
 
 
 def _require_cols(df: pd.DataFrame, cols: Iterable[str]):
@@ -22,6 +24,23 @@ def _require_cols(df: pd.DataFrame, cols: Iterable[str]):
         raise ValueError(f"DataFrame缺少必要列: {missing}, 现有列: {list(df.columns)[:10]}...")
 
 
+def _rolling(series: pd.Series, kind: str, n: int, min_periods: int) -> pd.Series:
+    """滑动窗口统计：numba 可用时走 _kernels 内核，否则使用 pandas rolling"""
+    if _kernels.NUMBA_AVAILABLE:
+        kernel = getattr(_kernels, f"rolling_{kind}")
+        values = kernel(series.to_numpy(dtype=np.float64), int(n), int(min_periods))
+        return pd.Series(values, index=series.index, name=series.name)
+    return getattr(series.rolling(window=int(n), min_periods=int(min_periods)), kind)()
+
+
+def _ewm(series: pd.Series, alpha: float, adjust: bool) -> pd.Series:
+    """指数加权均值：numba 可用时走 _kernels 递推内核，否则使用 pandas ewm"""
+    if _kernels.NUMBA_AVAILABLE:
+        values = _kernels.ewm_mean(series.to_numpy(dtype=np.float64), float(alpha), bool(adjust))
+        return pd.Series(values, index=series.index, name=series.name)
+    return series.ewm(alpha=alpha, adjust=adjust).mean()
+
+
 def ma(close: pd.Series, n: int, min_periods: int = None) -> pd.Series:
     """
     计算移动平均线（Moving Average）
@@ -36,7 +55,29 @@ def ma(close: pd.Series, n: int, min_periods: int = None) -> pd.Series:
     """
     if min_periods is None:
         min_periods = 1  # 默认为1，与现有代码保持一致
-    return close.rolling(window=int(n), min_periods=min_periods).mean()
+    return _rolling(close, "mean", n, min_periods)
+
+
+def _moving_averages(close: pd.Series, windows: Iterable[int], min_periods: int = 1) -> Dict[int, pd.Series]:
+    """
+    多个周期的移动平均共用一次前缀和：窗口和 = cs[t] - cs[t-n]
+
+    NaN 不计入窗口和与观测数，有效观测数不少于 min_periods 时才输出，与 ma() / pandas rolling 一致
+    """
+    x = close.to_numpy(dtype=np.float64)
+    valid = ~np.isnan(x)
+    csum = np.concatenate(([0.0], np.cumsum(np.where(valid, x, 0.0))))
+    ccount = np.concatenate(([0], np.cumsum(valid)))
+    end = np.arange(1, len(x) + 1)
+    result: Dict[int, pd.Series] = {}
+    for n in windows:
+        start = np.maximum(end - int(n), 0)
+        count = ccount[end] - ccount[start]
+        with np.errstate(invalid='ignore', divide='ignore'):
+            values = (csum[end] - csum[start]) / count
+        values[count < max(int(min_periods), 1)] = np.nan
+        result[n] = pd.Series(values, index=close.index, name=close.name)
+    return result
 
 
 def ema(close: pd.Series, n: int) -> pd.Series:
@@ -50,10 +91,11 @@ def ema(close: pd.Series, n: int) -> pd.Series:
     Returns:
         指数移动平均线序列
     """
-    return close.ewm(span=int(n), adjust=False).mean()
+    return _ewm(close, 2.0 / (int(n) + 1), adjust=False)
 
 
-def macd(close: pd.Series, fast: int = 12, slow: int = 26, signal: int = 9) -> pd.DataFrame:
+def macd(close: pd.Series, fast: int = 12, slow: int = 26, signal: int = 9,
+         ema_fast: Optional[pd.Series] = None, ema_slow: Optional[pd.Series] = None) -> pd.DataFrame:
     """
     计算MACD指标（Moving Average Convergence Divergence）
 
@@ -62,6 +104,8 @@ def macd(close: pd.Series, fast: int = 12, slow: int = 26, signal: int = 9) -> p
         fast: 快线周期，默认12
         slow: 慢线周期，默认26
         signal: 信号线周期，默认9
+        ema_fast: 已算好的快线 EMA（可选），传入时跳过重复的 ewm 计算
+        ema_slow: 已算好的慢线 EMA（可选），同上
 
     Returns:
         包含 dif, dea, macd_hist 的 DataFrame
@@ -69,8 +113,12 @@ def macd(close: pd.Series, fast: int = 12, slow: int = 26, signal: int = 9) -> p
         - dea: DIF的信号线（DEA）
         - macd_hist: MACD柱状图（DIF - DEA）
     """
-    dif = ema(close, fast) - ema(close, slow)
-    dea = dif.ewm(span=int(signal), adjust=False).mean()
+    if ema_fast is None:
+        ema_fast = ema(close, fast)
+    if ema_slow is None:
+        ema_slow = ema(close, slow)
+    dif = ema_fast - ema_slow
+    dea = _ewm(dif, 2.0 / (int(signal) + 1), adjust=False)
     hist = dif - dea
     return pd.DataFrame({"dif": dif, "dea": dea, "macd_hist": hist})
 
@@ -95,28 +143,46 @@ def rsi(close: pd.Series, n: int = 14, method: str = 'ema') -> pd.Series:
         - 'sma': 使用 rolling(window=n).mean()，简单移动平均
         - 'china': 使用 ewm(com=n-1, adjust=True)，与同花顺/通达信一致
     """
-    delta = close.diff()
-    gain = delta.where(delta > 0, 0)
-    loss = -delta.where(delta < 0, 0)
+    gain, loss = _gain_loss(close)
+    return _rsi_from_gain_loss(gain, loss, n, method)
+
 
+def _gain_loss(close: pd.Series):
+    """RSI 的涨幅/跌幅序列，同一收盘价的多个周期 RSI 可共用
+
+    直接在 float64 数组上差分并取正/负部分；首行及 NaN 差分与 Series.where 写法一样记为 0
+    """
+    x = close.to_numpy(dtype=np.float64)
+    delta = np.empty_like(x)
+    delta[:1] = np.nan
+    np.subtract(x[1:], x[:-1], out=delta[1:])
+    with np.errstate(invalid='ignore'):
+        gain = np.where(delta > 0, delta, 0.0)
+        loss = np.where(delta < 0, -delta, 0.0)
+    return (pd.Series(gain, index=close.index, name=close.name),
+            pd.Series(loss, index=close.index, name=close.name))
+
+
+def _rsi_from_gain_loss(gain: pd.Series, loss: pd.Series, n: int, method: str) -> pd.Series:
     if method == 'ema':
         # 国际标准：Wilder's指数移动平均
-        avg_gain = gain.ewm(alpha=1 / float(n), adjust=False).mean()
-        avg_loss = loss.ewm(alpha=1 / float(n), adjust=False).mean()
+        avg_gain = _ewm(gain, 1 / float(n), adjust=False)
+        avg_loss = _ewm(loss, 1 / float(n), adjust=False)
     elif method == 'sma':
         # 简单移动平均
-        avg_gain = gain.rolling(window=int(n), min_periods=1).mean()
-        avg_loss = loss.rolling(window=int(n), min_periods=1).mean()
+        avg_gain = _rolling(gain, "mean", n, 1)
+        avg_loss = _rolling(loss, "mean", n, 1)
     elif method == 'china':
         # 中国式SMA：同花顺/通达信风格
         # SMA(X, N, 1) = ewm(com=N-1, adjust=True).mean()
         # 参考：https://blog.csdn.net/u011218867/article/details/117427927
-        avg_gain = gain.ewm(com=int(n) - 1, adjust=True).mean()
-        avg_loss = loss.ewm(com=int(n) - 1, adjust=True).mean()
+        avg_gain = _ewm(gain, 1.0 / int(n), adjust=True)
+        avg_loss = _ewm(loss, 1.0 / int(n), adjust=True)
     else:
         raise ValueError(f"不支持的RSI计算方法: {method}，支持的方法: 'ema', 'sma', 'china'")
 
-    rs = avg_gain / (avg_loss.replace(0, np.nan))
+    # 平均跌幅为 0 时 RS 无定义：直接在 float64 数组上置 NaN，不经过 Series.replace
+    rs = avg_gain / np.where(avg_loss == 0, np.nan, avg_loss)
     rsi_val = 100 - (100 / (1 + rs))
     return rsi_val
 
@@ -139,117 +205,168 @@ def boll(close: pd.Series, n: int = 20, k: float = 2.0, min_periods: int = None)
     """
     if min_periods is None:
         min_periods = 1  # 默认为1，与现有代码保持一致
-    mid = close.rolling(window=int(n), min_periods=min_periods).mean()
-    std = close.rolling(window=int(n), min_periods=min_periods).std()
+    mid = _rolling(close, "mean", n, min_periods)
+    std = _rolling(close, "std", n, min_periods)
     upper = mid + k * std
     lower = mid - k * std
     return pd.DataFrame({"boll_mid": mid, "boll_upper": upper, "boll_lower": lower})
 
 
 def atr(high: pd.Series, low: pd.Series, close: pd.Series, n: int = 14) -> pd.Series:
-    prev_close = close.shift(1)
-    tr = pd.concat([
-        (high - low).abs(),
-        (high - prev_close).abs(),
-        (low - prev_close).abs(),
-    ], axis=1).max(axis=1)
-    return tr.rolling(window=int(n), min_periods=int(n)).mean()
+    h = high.to_numpy(dtype=np.float64)
+    l = low.to_numpy(dtype=np.float64)
+    c = close.to_numpy(dtype=np.float64)
+    prev_close = np.empty_like(c)
+    prev_close[:1] = np.nan
+    prev_close[1:] = c[:-1]
+    # 真实波幅：三者逐元素取最大（fmax 忽略 NaN，与 DataFrame.max(axis=1) 一致）
+    tr = np.fmax(np.fmax(np.abs(h - l), np.abs(h - prev_close)), np.abs(l - prev_close))
+    return _rolling(pd.Series(tr, index=close.index), "mean", n, n)
 
 
 def kdj(high: pd.Series, low: pd.Series, close: pd.Series, n: int = 9, m1: int = 3, m2: int = 3) -> pd.DataFrame:
-    lowest_low = low.rolling(window=int(n), min_periods=int(n)).min()
-    highest_high = high.rolling(window=int(n), min_periods=int(n)).max()
+    lowest_low = _rolling(low, "min", n, n)
+    highest_high = _rolling(high, "max", n, n)
     rsv = (close - lowest_low) / (highest_high - lowest_low) * 100
     # 处理除零与起始NaN
     rsv = rsv.replace([np.inf, -np.inf], np.nan)
 
-    # 按经典公式递推（初始化 50）
-    k = pd.Series(np.nan, index=close.index)
-    d = pd.Series(np.nan, index=close.index)
-    alpha_k = 1 / float(m1)
-    alpha_d = 1 / float(m2)
-    last_k = 50.0
-    last_d = 50.0
-    for i in range(len(close)):
-        rv = rsv.iloc[i]
-        if np.isnan(rv):
-            k.iloc[i] = np.nan
-            d.iloc[i] = np.nan
-            continue
-        curr_k = (1 - alpha_k) * last_k + alpha_k * rv
-        curr_d = (1 - alpha_d) * last_d + alpha_d * curr_k
-        k.iloc[i] = curr_k
-        d.iloc[i] = curr_d
-        last_k, last_d = curr_k, curr_d
+    # 按经典公式递推（初始化 50）：在 float64 数组上逐元素递推，numba 可用时编译执行
+    k_values, d_values = _kernels.kdj_recurrence(
+        rsv.to_numpy(dtype=np.float64), 1 / float(m1), 1 / float(m2)
+    )
+    k = pd.Series(k_values, index=close.index)
+    d = pd.Series(d_values, index=close.index)
     j = 3 * k - 2 * d
     return pd.DataFrame({"kdj_k": k, "kdj_d": d, "kdj_j": j})
 
 
-def compute_indicator(df: pd.DataFrame, spec: IndicatorSpec) -> pd.DataFrame:
+def _cached(cache: Optional[Dict[tuple, pd.Series]], key: tuple, fn) -> pd.Series:
+    """在一次批量计算内复用中间序列（如 EMA12/26、MA20），cache 为 None 时直接计算"""
+    if cache is None:
+        return fn()
+    if key not in cache:
+        cache[key] = fn()
+    return cache[key]
+
+
+def _apply_ma(df: pd.DataFrame, cols: Dict[str, pd.Series], params: Dict[str, Any],
+              cache: Optional[Dict[tuple, pd.Series]]) -> None:
+    _require_cols(df, ["close"])
+    n = int(params.get("n", params.get("period", 20)))
+    cols[f"ma{n}"] = _cached(cache, ("ma", n), lambda: ma(df["close"], n))
+
+
+def _apply_ema(df: pd.DataFrame, cols: Dict[str, pd.Series], params: Dict[str, Any],
+               cache: Optional[Dict[tuple, pd.Series]]) -> None:
+    _require_cols(df, ["close"])
+    n = int(params.get("n", params.get("period", 20)))
+    cols[f"ema{n}"] = _cached(cache, ("ema", n), lambda: ema(df["close"], n))
+
+
+def _apply_macd(df: pd.DataFrame, cols: Dict[str, pd.Series], params: Dict[str, Any],
+                cache: Optional[Dict[tuple, pd.Series]]) -> None:
+    _require_cols(df, ["close"])
+    fast = int(params.get("fast", 12))
+    slow = int(params.get("slow", 26))
+    signal = int(params.get("signal", 9))
+    # 快慢线 EMA 与 ema 指标共享
+    ema_fast = _cached(cache, ("ema", fast), lambda: ema(df["close"], fast))
+    ema_slow = _cached(cache, ("ema", slow), lambda: ema(df["close"], slow))
+    macd_df = macd(df["close"], fast, slow, signal, ema_fast=ema_fast, ema_slow=ema_slow)
+    for c in macd_df.columns:
+        cols[c] = macd_df[c]
+
+
+def _apply_rsi(df: pd.DataFrame, cols: Dict[str, pd.Series], params: Dict[str, Any],
+               cache: Optional[Dict[tuple, pd.Series]]) -> None:
+    _require_cols(df, ["close"])
+    n = int(params.get("n", params.get("period", 14)))
+    cols[f"rsi{n}"] = _cached(cache, ("rsi", n), lambda: rsi(df["close"], n))
+
+
+def _apply_boll(df: pd.DataFrame, cols: Dict[str, pd.Series], params: Dict[str, Any],
+                cache: Optional[Dict[tuple, pd.Series]]) -> None:
+    _require_cols(df, ["close"])
+    n = int(params.get("n", 20))
+    k = float(params.get("k", 2.0))
+    # 中轨即 n 日均线，与 ma 指标共享
+    mid = _cached(cache, ("ma", n), lambda: ma(df["close"], n))
+    std = _cached(cache, ("std", n), lambda: _rolling(df["close"], "std", n, 1))
+    cols["boll_mid"] = mid
+    cols["boll_upper"] = mid + k * std
+    cols["boll_lower"] = mid - k * std
+
+
+def _apply_atr(df: pd.DataFrame, cols: Dict[str, pd.Series], params: Dict[str, Any],
+               cache: Optional[Dict[tuple, pd.Series]]) -> None:
+    _require_cols(df, ["high", "low", "close"])
+    n = int(params.get("n", 14))
+    cols[f"atr{n}"] = atr(df["high"], df["low"], df["close"], n=n)
+
+
+def _apply_kdj(df: pd.DataFrame, cols: Dict[str, pd.Series], params: Dict[str, Any],
+               cache: Optional[Dict[tuple, pd.Series]]) -> None:
+    _require_cols(df, ["high", "low", "close"])
+    n = int(params.get("n", 9))
+    m1 = int(params.get("m1", 3))
+    m2 = int(params.get("m2", 3))
+    kdj_df = kdj(df["high"], df["low"], df["close"], n=n, m1=m1, m2=m2)
+    for c in kdj_df.columns:
+        cols[c] = kdj_df[c]
+
+
+# 指标名 -> 计算函数，一次字典查找完成分派
+_APPLIERS = {
+    "ma": _apply_ma,
+    "ema": _apply_ema,
+    "macd": _apply_macd,
+    "rsi": _apply_rsi,
+    "boll": _apply_boll,
+    "atr": _apply_atr,
+    "kdj": _apply_kdj,
+}
+
+
+def _apply_indicator(df: pd.DataFrame, spec: IndicatorSpec, cols: Dict[str, pd.Series],
+                     cache: Optional[Dict[tuple, pd.Series]] = None) -> None:
+    """将单个指标的结果列写入 cols（列名 -> Series），不修改 df"""
     name = spec.name.lower()
-    params = spec.params or {}
-    out = df.copy()
+    applier = _APPLIERS.get(name)
+    if applier is None:
+        raise ValueError(f"不支持的指标: {name}")
+    applier(df, cols, spec.params or {}, cache)
 
-    if name == "ma":
-        _require_cols(df, ["close"])
-        n = int(params.get("n", params.get("period", 20)))
-        out[f"ma{n}"] = ma(df["close"], n)
-        return out
 
-    if name == "ema":
-        _require_cols(df, ["close"])
-        n = int(params.get("n", params.get("period", 20)))
-        out[f"ema{n}"] = ema(df["close"], n)
-        return out
+def _assemble(df: pd.DataFrame, cols: Dict[str, pd.Series], dtype: Optional[Any] = None) -> pd.DataFrame:
+    """
+    把指标列一次性拼到 df 后面，返回新 DataFrame
 
-    if name == "macd":
-        _require_cols(df, ["close"])
-        fast = int(params.get("fast", 12))
-        slow = int(params.get("slow", 26))
-        signal = int(params.get("signal", 9))
-        macd_df = macd(df["close"], fast=fast, slow=slow, signal=signal)
-        for c in macd_df.columns:
-            out[c] = macd_df[c]
-        return out
+    新列先整体构造为一个 DataFrame 再 concat，避免逐列插入导致 block 碎片化
+    （PerformanceWarning）和反复整理；与 df 同名的列原位覆盖，保持列顺序。
+    dtype 只作用于新增列。
+    """
+    data = {c: s.to_numpy() for c, s in cols.items()}
+    existing = [c for c in data if c in df.columns]
+    # 只有需要覆盖已有列时才复制 df；concat 本身就返回新对象
+    base = df.copy() if existing or not data else df
+    for c in existing:
+        base[c] = data.pop(c)
+    if not data:
+        return base
+    if dtype is not None:
+        data = {c: v.astype(dtype, copy=False) for c, v in data.items()}
+    return pd.concat([base, pd.DataFrame(data, index=df.index)], axis=1)
 
-    if name == "rsi":
-        _require_cols(df, ["close"])
-        n = int(params.get("n", params.get("period", 14)))
-        out[f"rsi{n}"] = rsi(df["close"], n)
-        return out
 
-    if name == "boll":
-        _require_cols(df, ["close"])
-        n = int(params.get("n", 20))
-        k = float(params.get("k", 2.0))
-        boll_df = boll(df["close"], n=n, k=k)
-        for c in boll_df.columns:
-            out[c] = boll_df[c]
-        return out
-
-    if name == "atr":
-        _require_cols(df, ["high", "low", "close"])
-        n = int(params.get("n", 14))
-        out[f"atr{n}"] = atr(df["high"], df["low"], df["close"], n=n)
-        return out
-
-    if name == "kdj":
-        _require_cols(df, ["high", "low", "close"])
-        n = int(params.get("n", 9))
-        m1 = int(params.get("m1", 3))
-        m2 = int(params.get("m2", 3))
-        kdj_df = kdj(df["high"], df["low"], df["close"], n=n, m1=m1, m2=m2)
-        for c in kdj_df.columns:
-            out[c] = kdj_df[c]
-        return out
-
-    raise ValueError(f"不支持的指标: {name}")
-
-
-def compute_many(df: pd.DataFrame, specs: List[IndicatorSpec]) -> pd.DataFrame:
-    if not specs:
-        return df.copy()
-    # 粗略去重（按 name+sorted(params)）
+def compute_indicator(df: pd.DataFrame, spec: IndicatorSpec) -> pd.DataFrame:
+    cols: Dict[str, pd.Series] = {}
+    _apply_indicator(df, spec, cols)
+    return _assemble(df, cols)
+
+
+def _unique_specs(specs: List[IndicatorSpec]) -> List[IndicatorSpec]:
+    """按 name+sorted(params) 去重，并校验指标名"""
     def key(s: IndicatorSpec):
         p = s.params or {}
         items = tuple(sorted(p.items()))
@@ -263,17 +380,142 @@ def compute_many(df: pd.DataFrame, specs: List[IndicatorSpec]) -> pd.DataFrame:
             seen.add(k)
             unique_specs.append(s)
 
-    out = df.copy()
-    for s in unique_specs:
-        out = compute_indicator(out, s)
-    return out
+    # 复制数据前先校验，避免算到一半才因未知指标失败
+    unknown = [s.name for s in unique_specs if s.name.lower() not in SUPPORTED]
+    if unknown:
+        raise ValueError(f"不支持的指标: {unknown}")
+    return unique_specs
+
+
+def _compute_with_cache(df: pd.DataFrame, specs: List[IndicatorSpec], dtype: Optional[Any],
+                        cache: Dict[tuple, pd.Series]) -> pd.DataFrame:
+    # 各指标结果先收集到 cols 并复用共享的中间序列，最后一次性拼接
+    cols: Dict[str, pd.Series] = {}
+    for s in specs:
+        _apply_indicator(df, s, cols, cache)
+    return _assemble(df, cols, dtype)
+
+
+def compute_many(df: pd.DataFrame, specs: List[IndicatorSpec],
+                 dtype: Optional[Any] = None) -> pd.DataFrame:
+    """
+    批量计算多个指标
+
+    Args:
+        df: 行情数据
+        specs: 指标列表（自动去重）
+        dtype: 指标列的目标类型，默认保持 float64；批量分析时可传 np.float32
+            减半内存占用，序列化时再转回 Python float
+    """
+    if not specs:
+        return df.copy()
+    return _compute_with_cache(df, _unique_specs(specs), dtype, {})
+
+
+def _close_keys(spec: IndicatorSpec) -> List[tuple]:
+    """指标依赖的、只由收盘价决定的中间序列（与 _apply_* 中的缓存键一致）"""
+    name = spec.name.lower()
+    params = spec.params or {}
+    if name == "ma":
+        return [("ma", int(params.get("n", params.get("period", 20))))]
+    if name == "ema":
+        return [("ema", int(params.get("n", params.get("period", 20))))]
+    if name == "macd":
+        return [("ema", int(params.get("fast", 12))), ("ema", int(params.get("slow", 26)))]
+    if name == "rsi":
+        return [("rsi", int(params.get("n", params.get("period", 14))))]
+    if name == "boll":
+        n = int(params.get("n", 20))
+        return [("ma", n), ("std", n)]
+    return []
+
+
+def _close_matrix(close: pd.DataFrame, key: tuple) -> pd.DataFrame:
+    """对 (交易日, 股票) 收盘价矩阵按列计算中间序列，公式与单序列版本一致"""
+    kind, n = key
+    if kind == "ma":
+        return close.rolling(window=n, min_periods=1).mean()
+    if kind == "std":
+        return close.rolling(window=n, min_periods=1).std()
+    if kind == "ema":
+        return close.ewm(span=n, adjust=False).mean()
+    # rsi：Wilder 平滑（与 rsi(method='ema') 一致）
+    delta = close.diff()
+    gain = delta.where(delta > 0, 0.0)
+    loss = -delta.where(delta < 0, 0.0)
+    avg_gain = gain.ewm(alpha=1 / float(n), adjust=False).mean()
+    avg_loss = loss.ewm(alpha=1 / float(n), adjust=False).mean()
+    return 100 - 100 / (1 + avg_gain / avg_loss.mask(avg_loss == 0))
+
+
+def compute_many_batch(frames: Dict[str, pd.DataFrame], specs: List[IndicatorSpec],
+                       dtype: Optional[Any] = None) -> Dict[str, pd.DataFrame]:
+    """
+    多只股票批量计算指标，结果与逐只调用 compute_many 一致（浮点误差范围内）
+
+    行数相同的股票按列堆叠成 (交易日, 股票) 收盘价矩阵，ma/ema/macd/rsi/boll 依赖的中间序列
+    对整组一次计算，再按列拆回各股票的共享缓存；atr/kdj 等依赖高低价的指标仍逐只计算。
+    rolling/ewm 只沿行方向作用，各列互不影响，因此只需行数相同，无需日期对齐。
+
+    Args:
+        frames: 股票代码 -> 行情数据
+        specs: 指标列表（自动去重）
+        dtype: 同 compute_many
+
+    Returns:
+        股票代码 -> 含指标列的新 DataFrame
+    """
+    if not specs:
+        return {code: df.copy() for code, df in frames.items()}
+    unique_specs = _unique_specs(specs)
+    keys = list(dict.fromkeys(k for s in unique_specs for k in _close_keys(s)))
+
+    caches: Dict[str, Dict[tuple, pd.Series]] = {code: {} for code in frames}
+    groups: Dict[int, List[str]] = {}
+    for code, df in frames.items():
+        if "close" in df.columns:
+            groups.setdefault(len(df), []).append(code)
+
+    for codes in groups.values():
+        if len(codes) < 2 or not keys:
+            continue
+        close = pd.DataFrame(np.column_stack([frames[c]["close"].to_numpy(dtype=np.float64) for c in codes]))
+        for key in keys:
+            values = _close_matrix(close, key).to_numpy()
+            for j, code in enumerate(codes):
+                caches[code][key] = pd.Series(values[:, j], index=frames[code].index)
+
+    return {code: _compute_with_cache(df, unique_specs, dtype, caches[code]) for code, df in frames.items()}
 
 
 def last_values(df: pd.DataFrame, columns: List[str]) -> Dict[str, Any]:
+    """取指定列最后一行的值（缺列或 NaN 为 None）；只切出所需列的最后一行，一次转为 dict"""
     if df.empty:
         return {c: None for c in columns}
-    last = df.iloc[-1]
-    return {c: (None if c not in df.columns else (None if pd.isna(last.get(c)) else last.get(c))) for c in columns}
+    present = [c for c in dict.fromkeys(columns) if c in df.columns]
+    row = df[present].iloc[-1].to_dict() if present else {}
+    return {c: (None if c not in row or pd.isna(row[c]) else row[c]) for c in columns}
+
+
+_ALL_MA_WINDOWS = (5, 10, 20, 60)
+
+
+def _fused_close_indicators(close: pd.Series) -> Dict[str, Any]:
+    """调用 _kernels.fused_close_indicators，一次遍历得到 add_all_indicators 的收盘价类指标"""
+    ma_values, dif, dea, boll_std, rsi_values = _kernels.fused_close_indicators(
+        close.to_numpy(dtype=np.float64), np.asarray(_ALL_MA_WINDOWS, dtype=np.int64), 12, 26, 9, 20, 14
+    )
+
+    def series(values):
+        return pd.Series(values, index=close.index, name=close.name)
+
+    return {
+        "ma": {n: series(ma_values[i]) for i, n in enumerate(_ALL_MA_WINDOWS)},
+        "dif": series(dif),
+        "dea": series(dea),
+        "boll_std": series(boll_std),
+        "rsi": series(rsi_values),
+    }
 
 
 def add_all_indicators(df: pd.DataFrame, close_col: str = 'close',
@@ -294,7 +536,7 @@ def add_all_indicators(df: pd.DataFrame, close_col: str = 'close',
             - 'china': 中国风格（RSI6/12/24 + RSI14，使用中国式SMA）
 
     Returns:
-        添加了技术指标列的DataFrame（原地修改）
+        添加了技术指标列的新DataFrame（不修改传入的 df，调用方需使用返回值）
 
     添加的指标列：
         - ma5, ma10, ma20, ma60: 移动平均线
@@ -317,37 +559,50 @@ def add_all_indicators(df: pd.DataFrame, close_col: str = 'close',
     if close_col not in df.columns:
         raise ValueError(f"DataFrame缺少收盘价列: {close_col}")
 
+    # 收盘价只取一次，涨跌幅序列在各周期 RSI 间共用；
+    # 所有指标列先放进 dict，最后一次性拼接，避免逐列插入造成 DataFrame 碎片化
+    close = df[close_col]
+    # numba 可用时，MA / MACD / 布林带 / Wilder RSI 由融合内核一次遍历算出
+    fused = _fused_close_indicators(close) if _kernels.NUMBA_AVAILABLE else None
+    cols: Dict[str, pd.Series] = {}
+
     # 计算移动平均线（MA5, MA10, MA20, MA60）
-    df['ma5'] = ma(df[close_col], 5, min_periods=1)
-    df['ma10'] = ma(df[close_col], 10, min_periods=1)
-    df['ma20'] = ma(df[close_col], 20, min_periods=1)
-    df['ma60'] = ma(df[close_col], 60, min_periods=1)
+    mas = fused["ma"] if fused is not None else _moving_averages(close, _ALL_MA_WINDOWS)
+    for n, values in mas.items():
+        cols[f'ma{n}'] = values
 
     # 计算RSI指标
     if rsi_style == 'china':
+        gain, loss = _gain_loss(close)
         # 中国风格：RSI6, RSI12, RSI24（使用中国式SMA）
-        df['rsi6'] = rsi(df[close_col], 6, method='china')
-        df['rsi12'] = rsi(df[close_col], 12, method='china')
-        df['rsi24'] = rsi(df[close_col], 24, method='china')
+        for n in (6, 12, 24):
+            cols[f'rsi{n}'] = _rsi_from_gain_loss(gain, loss, n, 'china')
         # 保留RSI14作为国际标准参考（使用简单移动平均）
-        df['rsi14'] = rsi(df[close_col], 14, method='sma')
+        cols['rsi14'] = _rsi_from_gain_loss(gain, loss, 14, 'sma')
         # 为了兼容性，也添加 'rsi' 列（指向 rsi12）
-        df['rsi'] = df['rsi12']
+        cols['rsi'] = cols['rsi12']
+    elif fused is not None:
+        cols['rsi'] = fused["rsi"]
     else:
         # 国际标准：RSI14（使用EMA）
-        df['rsi'] = rsi(df[close_col], 14, method='ema')
+        gain, loss = _gain_loss(close)
+        cols['rsi'] = _rsi_from_gain_loss(gain, loss, 14, 'ema')
 
     # 计算MACD
-    macd_df = macd(df[close_col], fast=12, slow=26, signal=9)
-    df['macd_dif'] = macd_df['dif']
-    df['macd_dea'] = macd_df['dea']
-    df['macd'] = macd_df['macd_hist'] * 2  # 注意：这里乘以2是为了与通达信/同花顺保持一致
-
-    # 计算布林带（20日，2倍标准差）
-    boll_df = boll(df[close_col], n=20, k=2.0, min_periods=1)
-    df['boll_mid'] = boll_df['boll_mid']
-    df['boll_upper'] = boll_df['boll_upper']
-    df['boll_lower'] = boll_df['boll_lower']
-
-    return df
+    if fused is not None:
+        dif, dea = fused["dif"], fused["dea"]
+    else:
+        macd_df = macd(close, fast=12, slow=26, signal=9)
+        dif, dea = macd_df['dif'], macd_df['dea']
+    cols['macd_dif'] = dif
+    cols['macd_dea'] = dea
+    cols['macd'] = (dif - dea) * 2  # 注意：这里乘以2是为了与通达信/同花顺保持一致
+
+    # 计算布林带（20日，2倍标准差），中轨直接复用 ma20
+    boll_std = fused["boll_std"] if fused is not None else _rolling(close, "std", 20, 1)
+    cols['boll_mid'] = cols['ma20']
+    cols['boll_upper'] = cols['ma20'] + 2.0 * boll_std
+    cols['boll_lower'] = cols['ma20'] - 2.0 * boll_std
+
+    return pd.concat([df.drop(columns=list(cols), errors='ignore'), pd.DataFrame(cols)], axis=1)
 
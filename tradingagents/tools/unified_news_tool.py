@@ -218,10 +218,10 @@ class UnifiedNewsAnalyzer:
                     async def get_news_task():
                         try:
                             # 动态导入 AKShare provider（正确的导入路径）
-                            from tradingagents.dataflows.providers.china.akshare import AKShareProvider
+                            from tradingagents.dataflows.providers.china.akshare import get_akshare_provider
 
-                            # 创建 provider 实例
-                            provider = AKShareProvider()
+                            # 复用全局 provider 实例（避免每次重新初始化 AKShare 会话）
+                            provider = get_akshare_provider()
 
                             # 调用 provider 获取新闻
                             news_data = await provider.get_stock_news(
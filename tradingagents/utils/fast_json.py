@@ -0,0 +1,47 @@
+"""
+JSON 序列化工具
+
+缓存读写等热路径统一使用这里的 dumps/loads：安装了 orjson 时使用 orjson（C 实现，
+原生支持 numpy / datetime），否则退回标准库 json。
+
+- dumps 返回 bytes（orjson）或 str（json），两者都可以直接写入 Redis / 文件
+- loads 同时接受 bytes 和 str；遇到 orjson 不支持的旧数据（如 NaN 字面量）时退回 json 解析
+"""
+
+import json
+from typing import Any, Union
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:  # pragma: no cover - orjson 为可选依赖
+    orjson = None
+    ORJSON_AVAILABLE = False
+
+
+if ORJSON_AVAILABLE:
+    _ORJSON_OPTIONS = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+
+    def dumps(value: Any) -> Union[bytes, str]:
+        """序列化为 JSON（orjson 输出 UTF-8 bytes）"""
+        try:
+            return orjson.dumps(value, option=_ORJSON_OPTIONS)
+        except TypeError:
+            # orjson 不支持的类型（如超过 64 位的整数），退回标准库
+            return json.dumps(value, ensure_ascii=False)
+
+    def loads(raw: Union[bytes, bytearray, str]) -> Any:
+        """反序列化 JSON"""
+        try:
+            return orjson.loads(raw)
+        except orjson.JSONDecodeError:
+            # 兼容标准库写入的 NaN/Infinity 等非严格 JSON
+            return json.loads(raw)
+else:
+    def dumps(value: Any) -> Union[bytes, str]:
+        """序列化为 JSON"""
+        return json.dumps(value, ensure_ascii=False)
+
+    def loads(raw: Union[bytes, bytearray, str]) -> Any:
+        """反序列化 JSON"""
+        return json.loads(raw)